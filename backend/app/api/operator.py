@@ -190,13 +190,15 @@ class ImagesInFolderResponse(BaseModel):
     images: list[ImageInFolderItem]
 
 
-def _path_under_root(p: Path, root: Path) -> bool:
-    """True if p is under root (or equal)."""
-    try:
-        p.resolve().relative_to(root.resolve())
-        return True
-    except ValueError:
-        return False
+def _root_prefix(root: Path) -> str:
+    """Resolved root as a normalized string ending in a separator, for _path_under_root."""
+    return os.path.normcase(str(root.resolve())).rstrip(os.sep) + os.sep
+
+
+def _path_under_root(p: Path, root_prefix: str) -> bool:
+    """True if p is under the root (or equal) given by _root_prefix."""
+    s = os.path.normcase(str(p.resolve()))
+    return s.startswith(root_prefix) or s == root_prefix[:-1]
 
 
 @router.get("/images-in-folder", response_model=ImagesInFolderResponse)
@@ -222,8 +224,7 @@ async def images_in_folder(
         raise HTTPException(status_code=400, detail="Path must be a directory")
 
     if source_root:
-        src = Path(source_root).resolve()
-        if not _path_under_root(folder, src):
+        if not _path_under_root(folder, _root_prefix(Path(source_root))):
             raise HTTPException(status_code=400, detail="Path must be under source directory. Save Configuration first if you changed the source.")
 
     exts = {e.lower() for e in settings.supported_extensions}
@@ -314,6 +315,8 @@ async def set_job_configuration(request: JobConfigRequest):
     
     # Validate selected_image_paths when provided
     if request.selected_image_paths:
+        # Resolve the root once rather than per selected image
+        source_prefix = _root_prefix(source_path)
         for p in request.selected_image_paths:
             pp = Path(p)
             if not pp.exists():
@@ -326,7 +329,7 @@ async def set_job_configuration(request: JobConfigRequest):
                     status_code=400,
                     detail=f"Selected path is not a file: {p}"
                 )
-            if not _path_under_root(pp, source_path):
+            if not _path_under_root(pp, source_prefix):
                 raise HTTPException(
                     status_code=400,
                     detail=f"Selected image must be under source directory: {p}"
@@ -3,6 +3,7 @@ Tracker API endpoints.
 Read-only endpoints that read state files only.
 """
 import json
+import time
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
@@ -113,17 +114,23 @@ async def get_worker_status():
         with open(heartbeat_file, "r") as f:
             data = json.load(f)
         
-        last_heartbeat = data.get("timestamp")
         status = data.get("status", "unknown")
         pid = data.get("pid")
         
-        if last_heartbeat:
-            # Parse ISO timestamp
-            heartbeat_time = datetime.fromisoformat(last_heartbeat)
-            now = datetime.now()
-            
+        # Epoch nanoseconds; older workers wrote an ISO "timestamp" instead
+        ts_ns = data.get("ts_ns")
+        if ts_ns is not None:
+            age_seconds = (time.time_ns() - ts_ns) / 1e9
+            last_heartbeat = datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+        else:
+            last_heartbeat = data.get("timestamp")
+            age_seconds = None
+            if last_heartbeat:
+                age_seconds = (datetime.now() - datetime.fromisoformat(last_heartbeat)).total_seconds()
+        
+        if age_seconds is not None:
             # Worker is online if heartbeat within 10 seconds
-            if (now - heartbeat_time).total_seconds() < 10:
+            if age_seconds < 10:
                 return WorkerStatusResponse(
                     online=True,
                     last_heartbeat=last_heartbeat,
@@ -39,6 +39,19 @@ class Settings(BaseSettings):
         description="Maximum embeddings stored per person (FIFO trimming)"
     )
     
+    # Faces smaller than this (bbox area in pixels) are dropped before
+    # recognition; their embeddings are too noisy to match. 0 disables.
+    min_face_area_px: int = Field(
+        default=1600,
+        description="Minimum detected face bbox area in pixels (1600 = 40x40) to compute an embedding"
+    )
+    
+    # Recognition model precision
+    use_quantized_recognition: bool = Field(
+        default=False,
+        description="Run the ArcFace recognition model as a dynamically quantized int8 copy on CPU (faster; embeddings differ slightly from FP32, so enable it before building the registry)"
+    )
+    
     # Batch processing
     atomic_batch_size: int = Field(
         default=50,
@@ -55,9 +68,20 @@ class Settings(BaseSettings):
         description="JPEG quality for output images"
     )
     
+    # Flush state files to disk before the rename that publishes them
+    # (only for batch-level progress updates, not per-image ones)
+    atomic_fsync: bool = Field(
+        default=True,
+        description="fdatasync batch-level state file writes so a crash can't leave them empty"
+    )
+    
     # Server settings
     server_host: str = Field(default="127.0.0.1")
     server_port: int = Field(default=8000)
+    debug: bool = Field(
+        default=False,
+        description="Development mode: reload edited templates without restarting"
+    )
     
     # Supported input extensions
     supported_extensions: tuple = (".jpg", ".jpeg", ".arw")
@@ -165,6 +189,11 @@ class Settings(BaseSettings):
         """Directory for face recognition models."""
         return self.hot_storage_root / "models"
     
+    @property
+    def cache_dir(self) -> Path:
+        """Directory for rebuildable caches (e.g., source discovery index)."""
+        return self.hot_storage_root / "cache"
+    
     def ensure_directories(self) -> None:
         """Create all required hot storage directories."""
         self.hot_storage_root.mkdir(parents=True, exist_ok=True)
@@ -172,6 +201,7 @@ class Settings(BaseSettings):
         self.staging_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
 
 
 # Global settings instance
@@ -27,6 +27,13 @@ async def get_db() -> aiosqlite.Connection:
         await _db_connection.execute("PRAGMA foreign_keys = ON")
         # Enable WAL mode for better concurrency
         await _db_connection.execute("PRAGMA journal_mode = WAL")
+        # WAL stays consistent with NORMAL; only the last commits before a
+        # power loss may roll back, and a commit no longer fsyncs the WAL
+        await _db_connection.execute("PRAGMA synchronous = NORMAL")
+        # The connection lives for the whole process: give it a 64 MiB page
+        # cache and keep temp b-trees (sorts, GROUP BY) in memory
+        await _db_connection.execute("PRAGMA cache_size = -64000")
+        await _db_connection.execute("PRAGMA temp_store = MEMORY")
         # Row factory for dict-like access
         _db_connection.row_factory = aiosqlite.Row
     
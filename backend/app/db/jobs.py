@@ -2,12 +2,18 @@
 Job and batch database operations.
 Handles job configuration, images, batches, and commit log.
 """
+import asyncio
 import json
+import os
+import time
+from collections import OrderedDict
 from enum import Enum
 from typing import Optional
 from pathlib import Path
 
 from .db import get_db, get_db_transaction
+from ..config import settings
+from ..storage.paths import compute_file_hash
 
 
 class BatchState(str, Enum):
@@ -18,6 +24,46 @@ class BatchState(str, Enum):
     COMMITTED = "COMMITTED"
 
 
+# ============================================================================
+# Worker Wake Signal
+# ============================================================================
+
+# Replaced whenever the job config or status changes. The worker runs in a
+# separate process and watches this file instead of polling the database;
+# each replace yields a new inode, so back-to-back signals within one mtime
+# tick are still distinct. It lives in its own directory so a directory
+# watch (inotify) only fires for wake signals, not for progress/heartbeat
+# writes in state_dir.
+WAKE_FILE_NAME = "worker_wake"
+
+
+def wake_dir() -> Path:
+    """Directory holding the worker wake file."""
+    return settings.state_dir / "wake"
+
+
+def signal_worker() -> None:
+    """Tell the worker that job config or status changed."""
+    wake_file = wake_dir() / WAKE_FILE_NAME
+    temp_file = wake_file.with_suffix(".tmp")
+    try:
+        wake_file.parent.mkdir(exist_ok=True)
+        with open(temp_file, "w") as f:
+            f.write(str(time.time_ns()))
+        os.replace(temp_file, wake_file)
+    except OSError:
+        pass  # The worker falls back to its periodic check
+
+
+def wake_signal_stamp() -> Optional[tuple[int, int]]:
+    """Identity of the current wake signal, or None if never signalled."""
+    try:
+        st = os.stat(wake_dir() / WAKE_FILE_NAME)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
 # ============================================================================
 # Job Configuration
 # ============================================================================
@@ -98,6 +144,7 @@ async def save_job_config(
         (source_root, output_root, selected_json, selected_paths_json, group_mode_str, group_folder_name)
     )
     await db.commit()
+    signal_worker()
 
 
 async def get_job_status() -> str:
@@ -137,6 +184,7 @@ async def set_job_status(status: str) -> None:
         (status,)
     )
     await db.commit()
+    signal_worker()
 
 
 # ============================================================================
@@ -271,6 +319,73 @@ async def update_image_hash(image_id: int, sha256: str) -> None:
     await db.commit()
 
 
+# In-process LRU in front of file_hash_cache: (path, size, mtime_ns) -> sha256.
+# A file hashed at ingest is looked up again when its batch runs; this
+# answers that without a database round trip.
+_HASH_MEMO_SIZE = 4096
+_hash_memo: "OrderedDict[tuple, str]" = OrderedDict()
+
+
+def _remember_hash(key: tuple, sha256: str) -> None:
+    _hash_memo[key] = sha256
+    _hash_memo.move_to_end(key)
+    if len(_hash_memo) > _HASH_MEMO_SIZE:
+        _hash_memo.popitem(last=False)
+
+
+async def cached_file_hash(
+    file_path: Path,
+    pending_rows: Optional[list[tuple]] = None
+) -> str:
+    """
+    SHA-256 of a file, reusing a cached digest while size and mtime match.
+    
+    The full-file read runs on a worker thread and only on a cache miss.
+    If pending_rows is given, a new cache row is appended to it instead of
+    being written, so the caller can persist it with save_file_hashes()
+    (this call then only reads from the database).
+    """
+    path = str(file_path)
+    st = await asyncio.to_thread(os.stat, path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    sha256 = _hash_memo.get(key)
+    if sha256 is not None:
+        _hash_memo.move_to_end(key)
+        return sha256
+    
+    db = await get_db()
+    cursor = await db.execute(
+        "SELECT sha256 FROM file_hash_cache WHERE path = ? AND size = ? AND mtime_ns = ?",
+        key
+    )
+    row = await cursor.fetchone()
+    if row:
+        _remember_hash(key, row["sha256"])
+        return row["sha256"]
+    
+    sha256 = await asyncio.to_thread(compute_file_hash, file_path)
+    _remember_hash(key, sha256)
+    if pending_rows is not None:
+        pending_rows.append((path, st.st_size, st.st_mtime_ns, sha256))
+    else:
+        await save_file_hashes([(path, st.st_size, st.st_mtime_ns, sha256)])
+    
+    return sha256
+
+
+async def save_file_hashes(rows: list[tuple]) -> None:
+    """Record (path, size, mtime_ns, sha256) rows in the file hash cache."""
+    if not rows:
+        return
+    
+    async with get_db_transaction() as db:
+        await db.executemany(
+            """INSERT OR REPLACE INTO file_hash_cache (path, size, mtime_ns, sha256)
+               VALUES (?, ?, ?, ?)""",
+            rows
+        )
+
+
 async def get_image_count(job_id: int) -> int:
     """Get total image count for a job."""
     db = await get_db()
@@ -361,6 +476,36 @@ async def get_batches_by_state(state: BatchState) -> list[dict]:
     return [dict(row) for row in rows]
 
 
+async def get_batches_by_states(states: list[BatchState]) -> list[dict]:
+    """Get all batches in any of the given states, in one query."""
+    db = await get_db()
+    
+    placeholders = ", ".join("?" * len(states))
+    cursor = await db.execute(
+        f"SELECT * FROM batches WHERE state IN ({placeholders}) ORDER BY batch_id",
+        [state.value for state in states]
+    )
+    rows = await cursor.fetchall()
+    
+    return [dict(row) for row in rows]
+
+
+async def reset_processing_batches() -> int:
+    """
+    Move every PROCESSING batch back to PENDING in one statement.
+    
+    Returns the number of batches that were reset.
+    """
+    db = await get_db()
+    
+    cursor = await db.execute(
+        "UPDATE batches SET state = ? WHERE state = ?",
+        (BatchState.PENDING.value, BatchState.PROCESSING.value)
+    )
+    await db.commit()
+    return cursor.rowcount
+
+
 async def get_batch_by_id(batch_id: int) -> Optional[dict]:
     """Get a specific batch by ID."""
     db = await get_db()
@@ -396,6 +541,24 @@ async def update_batch_state(batch_id: int, state: BatchState) -> None:
     await db.commit()
 
 
+async def commit_batch_with_counts(
+    batch_id: int,
+    job_id: int,
+    total: int,
+    processed: int
+) -> None:
+    """Mark a batch COMMITTED and update its job's image counts in one transaction."""
+    async with get_db_transaction() as db:
+        await db.execute(
+            "UPDATE batches SET state = ?, committed_at = datetime('now') WHERE batch_id = ?",
+            (BatchState.COMMITTED.value, batch_id)
+        )
+        await db.execute(
+            "UPDATE jobs SET total_images = ?, processed_images = ? WHERE job_id = ?",
+            (total, processed, job_id)
+        )
+
+
 async def get_committed_batch_count(job_id: int) -> int:
     """Get count of committed batches for a job."""
     db = await get_db()
@@ -442,12 +605,46 @@ async def save_image_result(
     return cursor.lastrowid
 
 
+async def save_image_results_bulk(batch_id: int, results: list[dict]) -> None:
+    """
+    Save many image processing results in a single transaction.
+    
+    Each result dict carries image_id, face_count, matched_count,
+    unknown_count and matched_person_ids. Results that carry a sha256 also
+    back-fill images.sha256 where it is still NULL.
+    """
+    if not results:
+        return
+    
+    async with get_db_transaction() as db:
+        await db.executemany(
+            """INSERT INTO image_results 
+               (image_id, batch_id, face_count, matched_count, unknown_count, matched_person_ids)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(image_id) DO UPDATE SET
+                   face_count = excluded.face_count,
+                   matched_count = excluded.matched_count,
+                   unknown_count = excluded.unknown_count,
+                   matched_person_ids = excluded.matched_person_ids,
+                   processed_at = datetime('now')""",
+            [
+                (r["image_id"], batch_id, r["face_count"], r["matched_count"],
+                 r["unknown_count"], json.dumps(r["matched_person_ids"]))
+                for r in results
+            ]
+        )
+        await db.executemany(
+            "UPDATE images SET sha256 = ? WHERE image_id = ? AND sha256 IS NULL",
+            [(r["sha256"], r["image_id"]) for r in results if r.get("sha256")]
+        )
+
+
 async def get_image_results_for_batch(batch_id: int) -> list[dict]:
     """Get all image results for a batch."""
     db = await get_db()
     
     cursor = await db.execute(
-        """SELECT ir.*, i.source_path, i.filename, i.sha256
+        """SELECT ir.*, i.source_path, i.filename, i.extension, i.sha256
            FROM image_results ir
            INNER JOIN images i ON ir.image_id = i.image_id
            WHERE ir.batch_id = ?""",
@@ -140,26 +140,7 @@ async def add_person_embedding(
         embedding_id = cursor.lastrowid
         
         # Check if we need to trim (FIFO)
-        cursor = await db.execute(
-            """SELECT COUNT(*) as cnt FROM person_embeddings WHERE person_id = ?""",
-            (person_id,)
-        )
-        row = await cursor.fetchone()
-        count = row["cnt"]
-        
-        if count > settings.max_embeddings_per_person:
-            # Delete oldest embeddings to stay under limit
-            excess = count - settings.max_embeddings_per_person
-            await db.execute(
-                """DELETE FROM person_embeddings 
-                   WHERE embedding_id IN (
-                       SELECT embedding_id FROM person_embeddings
-                       WHERE person_id = ?
-                       ORDER BY created_at ASC
-                       LIMIT ?
-                   )""",
-                (person_id, excess)
-            )
+        await _trim_embeddings(db, person_id)
         
         # Update centroid
         await _update_centroid(db, person_id)
@@ -167,6 +148,59 @@ async def add_person_embedding(
     return embedding_id
 
 
+async def add_person_embeddings(
+    person_id: int,
+    embeddings: list[np.ndarray],
+    source_type: str = "reference"
+) -> None:
+    """
+    Add several embeddings to a person in one transaction.
+    Same effect as calling add_person_embedding for each, but trims and
+    recomputes the centroid only once.
+    """
+    if not embeddings:
+        return
+    
+    async with get_db_transaction() as db:
+        await db.executemany(
+            """INSERT INTO person_embeddings (person_id, embedding, source_type)
+               VALUES (?, ?, ?)""",
+            [
+                (person_id, serialize_embedding(embedding), source_type)
+                for embedding in embeddings
+            ]
+        )
+        await _trim_embeddings(db, person_id)
+        await _update_centroid(db, person_id)
+
+
+async def _trim_embeddings(db, person_id: int) -> None:
+    """
+    Delete a person's oldest embeddings beyond max_embeddings_per_person.
+    Called within a transaction.
+    """
+    cursor = await db.execute(
+        """SELECT COUNT(*) as cnt FROM person_embeddings WHERE person_id = ?""",
+        (person_id,)
+    )
+    row = await cursor.fetchone()
+    count = row["cnt"]
+    
+    if count > settings.max_embeddings_per_person:
+        # Delete oldest embeddings to stay under limit
+        excess = count - settings.max_embeddings_per_person
+        await db.execute(
+            """DELETE FROM person_embeddings 
+               WHERE embedding_id IN (
+                   SELECT embedding_id FROM person_embeddings
+                   WHERE person_id = ?
+                   ORDER BY created_at ASC, embedding_id ASC
+                   LIMIT ?
+               )""",
+            (person_id, excess)
+        )
+
+
 async def _update_centroid(db, person_id: int) -> None:
     """
     Update the centroid for a person based on all embeddings.
@@ -237,6 +271,34 @@ async def get_all_centroids() -> list[dict]:
     ]
 
 
+async def get_centroid(person_id: int) -> Optional[np.ndarray]:
+    """Get a single person's centroid, or None if they have none."""
+    db = await get_db()
+    
+    cursor = await db.execute(
+        "SELECT centroid FROM person_centroids WHERE person_id = ?",
+        (person_id,)
+    )
+    row = await cursor.fetchone()
+    
+    return deserialize_embedding(row["centroid"]) if row else None
+
+
+async def get_registry_version() -> int:
+    """
+    Get the registry version counter.
+    Bumped by triggers on every centroid or person change.
+    """
+    db = await get_db()
+    
+    cursor = await db.execute(
+        "SELECT version FROM registry_version WHERE version_id = 1"
+    )
+    row = await cursor.fetchone()
+    
+    return row["version"] if row else 0
+
+
 async def get_person_embeddings(person_id: int) -> list[np.ndarray]:
     """Get all embeddings for a person."""
     db = await get_db()
@@ -36,6 +36,45 @@ CREATE TABLE IF NOT EXISTS person_centroids (
     FOREIGN KEY (person_id) REFERENCES persons(person_id)
 );
 
+-- Registry version - bumped on any change that affects matching centroids
+-- so in-memory matcher caches can skip reloading when nothing changed
+CREATE TABLE IF NOT EXISTS registry_version (
+    version_id INTEGER PRIMARY KEY CHECK (version_id = 1),  -- Singleton
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO registry_version (version_id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_registry_version_centroid_insert
+    AFTER INSERT ON person_centroids
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE version_id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registry_version_centroid_update
+    AFTER UPDATE ON person_centroids
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE version_id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registry_version_centroid_delete
+    AFTER DELETE ON person_centroids
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE version_id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registry_version_person_update
+    AFTER UPDATE ON persons
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE version_id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registry_version_person_delete
+    AFTER DELETE ON persons
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE version_id = 1;
+END;
+
 -- ============================================================================
 -- JOB CONFIGURATION
 -- ============================================================================
@@ -86,6 +125,15 @@ CREATE INDEX IF NOT EXISTS idx_images_job ON images(job_id);
 CREATE INDEX IF NOT EXISTS idx_images_ordering ON images(job_id, ordering_idx);
 CREATE INDEX IF NOT EXISTS idx_images_sha256 ON images(sha256);
 
+-- File hash cache - survives job resets so unchanged files are never re-read
+-- A row is valid only while (size, mtime_ns) still match the file on disk
+CREATE TABLE IF NOT EXISTS file_hash_cache (
+    path TEXT PRIMARY KEY,  -- Absolute source path
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+
 -- Batches table - atomic 50-image batches
 CREATE TABLE IF NOT EXISTS batches (
     batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
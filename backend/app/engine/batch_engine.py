@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime
 import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 from ..config import settings
 from ..state.state_writer import StateWriter
@@ -24,24 +26,41 @@ from ..db.jobs import (
     get_batch_by_id,
     get_images_for_batch,
     update_batch_state,
-    save_image_result,
+    save_image_results_bulk,
     get_image_results_for_batch,
-    update_job_image_counts,
     get_active_job,
     get_committed_batch_count,
+    commit_batch_with_counts,
     get_image_count,
     get_job_status,
+    cached_file_hash,
+    save_file_hashes,
 )
 from ..db.registry import get_person_by_id
-from ..storage.paths import compute_file_hash
 from .faces import FaceEngine
 from .match import FaceMatcher
-from .compress import CompressionEngine
-from .raw_convert import RawConversionEngine
+from .compress import get_compression_engine, compress_image
+from .raw_convert import (
+    get_raw_engine,
+    convert_raw_for_recognition,
+    convert_raw_for_delivery,
+)
 from .routing import RoutingEngine
 from .ingest import IngestEngine
 
 
+# Minimum seconds between progress file writes while a batch is streaming
+PROGRESS_FLUSH_INTERVAL = 0.25
+
+# Batches with no matches only print the console summary this often
+SUMMARY_EVERY_N_EMPTY_BATCHES = 10
+
+
+def _all_exist(paths: list[str]) -> bool:
+    """True if every path exists (lstat only; run in a thread)."""
+    return all(map(os.path.lexists, paths))
+
+
 class BatchEngine:
     """
     Orchestrates batch processing with atomic state transitions.
@@ -71,19 +90,46 @@ class BatchEngine:
         self.group_mode = group_mode
         self.group_folder_name = group_folder_name
         
+        # Job invariant: people who must ALL appear for a group-mode match
+        # (None when not in group mode)
+        self._required_person_ids: Optional[frozenset[int]] = (
+            frozenset(selected_person_ids)
+            if group_mode and selected_person_ids else None
+        )
+        
         # Initialize engines
         self.face_engine = FaceEngine()
         self.matcher = FaceMatcher(selected_person_ids=selected_person_ids)
-        self.compression_engine = CompressionEngine()
-        self.raw_engine = RawConversionEngine()
+        self.compression_engine = get_compression_engine()
+        self.raw_engine = get_raw_engine()
         self.routing_engine = RoutingEngine(output_root)
         self.ingest_engine = IngestEngine(source_root, output_root)
         
+        # RAW demosaic (libraw) and JPEG decode/resize/encode are CPU-heavy and
+        # hold the GIL for much of their work, so they run in worker processes
+        # instead of the event loop
+        self._cpu_pool = ProcessPoolExecutor(max_workers=settings.get_worker_count())
+        
         # Track current state for progress reporting
         self.current_job_id: Optional[int] = None
         self.total_images: int = 0
         self.processed_images: int = 0
         self.start_time: Optional[datetime] = None
+        # File hash cache rows computed during the current batch; written
+        # with the batch results rather than from concurrent workers
+        self._new_file_hashes: list[tuple] = []
+        # COMMITTED batch count for the current job; seeded from the DB on
+        # first use, then maintained in memory (see _mark_batch_committed)
+        self._committed_batches: Optional[int] = None
+        
+        # Coalesced progress writes (see _progress_loop)
+        self._progress_state: Optional[dict] = None
+        self._progress_dirty = asyncio.Event()
+        self._progress_task: Optional[asyncio.Task] = None
+    
+    def close(self) -> None:
+        """Shut down the image processing pool."""
+        self._cpu_pool.shutdown(wait=True, cancel_futures=True)
     
     async def discover_images(self) -> dict:
         """
@@ -98,6 +144,7 @@ class BatchEngine:
         
         self.current_job_id = result["job_id"]
         self.total_images = result["image_count"]
+        self._committed_batches = None  # Re-seeded from the DB on first commit
         self.start_time = datetime.now()  # Start timer
         
         # Update progress
@@ -132,7 +179,7 @@ class BatchEngine:
         images = await get_images_for_batch(batch_id)
         if not images:
             # Empty batch - mark as committed
-            await update_batch_state(batch_id, BatchState.COMMITTED)
+            await self._mark_batch_committed(batch_id, job_id, batch_result_count=0)
             return {"batch_id": batch_id, "status": "empty"}
         
         # Get image range for progress display
@@ -158,44 +205,30 @@ class BatchEngine:
         
         # Configure worker count
         worker_count = settings.get_worker_count() if settings.enable_parallel_processing else 1
-        semaphore = asyncio.Semaphore(worker_count)
         
         commit_results_all = []
         process_results_all = []
         
-        async def process_and_commit_single(image):
-            """Analyze one image and commit it immediately if matched."""
+        async def process_single(image):
+            """Analyze one image and hand it to the committers if matched."""
             try:
                 # 1. ANALYZE
-                async with semaphore:
-                    # Update progress for analysis
-                    self._update_progress(
-                        current_batch_id=batch_id,
-                        current_batch_state="PROCESSING",
-                        current_image_range=image_range,
-                        current_superbatch=superbatch,
-                        current_image=Path(image["source_path"]).name,
-                    )
-                    proc_result = await self._process_image(image, batch_id)
+                # Update progress for analysis
+                self._update_progress(
+                    current_batch_id=batch_id,
+                    current_batch_state="PROCESSING",
+                    current_image_range=image_range,
+                    current_superbatch=superbatch,
+                    current_image=image["filename"],
+                )
+                proc_result = await self._process_image(image, batch_id)
                 
                 process_results_all.append(proc_result)
                 
-                # 2. COMMIT (if matched)
+                # 2. COMMIT (if matched) - queued so analysis of the next
+                # image is not held up by compression and HDD writes
                 if proc_result.get("matched_count", 0) > 0:
-                     self._update_progress(
-                        current_batch_state="WRITING",  # Ephemeral state for UI
-                        current_image=Path(image["source_path"]).name
-                    )
-                     # Commit immediately
-                     c_result = await self._commit_image(proc_result, batch_id)
-                     
-                     if c_result.get("routed"):
-                        last_routed = c_result["routed"][-1]
-                        self._update_progress(
-                            last_committed_person=last_routed.get("person_name"),
-                            last_committed_image=c_result.get("output_filename"),
-                        )
-                     commit_results_all.append(c_result)
+                    await commit_queue.put(proc_result)
                 
                 return proc_result
             except Exception as e:
@@ -206,21 +239,78 @@ class BatchEngine:
                 err_result = {"error": str(e), "skipped": True}
                 process_results_all.append(err_result) # Ensure we track the failure
                 return err_result
+        
+        async def commit_single(proc_result):
+            """Compress and route one matched image."""
+            try:
+                self._update_progress(
+                    current_batch_state="WRITING",  # Ephemeral state for UI
+                    current_image=proc_result["filename"]
+                )
+                c_result = await self._commit_image(proc_result, batch_id)
+                
+                if c_result.get("routed"):
+                    last_routed = c_result["routed"][-1]
+                    self._update_progress(
+                        last_committed_person=last_routed.get("person_name"),
+                        last_committed_image=c_result.get("output_filename"),
+                    )
+                commit_results_all.append(c_result)
+            except Exception as e:
+                print(f"Error committing image {proc_result['source_path']}: {e}")
+                import traceback
+                traceback.print_exc()
 
         # Run stream
-        # Process in chunks to respect termination signals
-        TERMINATE_CHUNK = 10
+        # A fixed pool of workers drains a bounded queue, so a slow image
+        # (e.g. RAW) never holds back the others at a chunk boundary.
+        # Matched images go to a second pool of committers, so analysis
+        # (CPU/GPU bound) overlaps with compression and routing (I/O bound).
+        # The producer checks for termination every TERMINATE_CHECK images.
+        TERMINATE_CHECK = 10
+        queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+        commit_queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+        
+        async def worker():
+            while (image := await queue.get()) is not None:
+                await process_single(image)
+        
+        async def committer():
+            while (proc_result := await commit_queue.get()) is not None:
+                await commit_single(proc_result)
+        
+        async def produce():
+            for i, image in enumerate(images):
+                if i % TERMINATE_CHECK == 0 and await get_job_status() == "terminating":
+                    break
+                await queue.put(image)
+            for _ in range(worker_count):
+                await queue.put(None)
         
-        for i in range(0, len(images), TERMINATE_CHUNK):
-            if await get_job_status() == "terminating":
-                break
-            
-            chunk = images[i : i + TERMINATE_CHUNK]
-            if settings.enable_parallel_processing:
-                await asyncio.gather(*[process_and_commit_single(im) for im in chunk])
-            else:
-                for im in chunk:
-                    await process_and_commit_single(im)
+        self._progress_task = asyncio.create_task(self._progress_loop())
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+        committers = [asyncio.create_task(committer()) for _ in range(worker_count)]
+        try:
+            await produce()
+            await asyncio.gather(*workers)
+            for _ in committers:
+                await commit_queue.put(None)
+            await asyncio.gather(*committers)
+        finally:
+            for t in workers + committers:
+                t.cancel()
+            await self._stop_progress_loop()
+        
+        # Learn strict matches from this batch (one write per person)
+        await self.matcher.flush_learn()
+        
+        # Persist all image results (and newly computed hashes) in one transaction
+        await save_image_results_bulk(
+            batch_id,
+            [r for r in process_results_all if "image_id" in r]
+        )
+        new_file_hashes, self._new_file_hashes = self._new_file_hashes, []
+        await save_file_hashes(new_file_hashes)
         
         # Mark batch valid/complete
         # Even if we "committed" items one by one, we set batch to COMMITTED at end
@@ -228,13 +318,10 @@ class BatchEngine:
         # Logic remains: Batch is unit of "Done".
         
         # Skip the old "COMMITTING" phase logic
-        await update_batch_state(batch_id, BatchState.COMMITTED)
-        
-        # Update job total
-        # We need to count how many we actually committed in this run
-        route_count = len([c for c in commit_results_all if c.get("status") == "committed" or c.get("status") == "success"])
-        # Actually job progress is based on "images processed" not "written"
-        await self._update_job_progress(job_id, batch_result_count=len(process_results_all))
+        # Job progress is based on "images processed" not "written"
+        await self._mark_batch_committed(
+            batch_id, job_id, batch_result_count=len(process_results_all)
+        )
         
         self._update_progress(current_batch_state="COMMITTED")
         self._print_progress_summary()
@@ -256,37 +343,45 @@ class BatchEngine:
         """
         Process a single image: detect faces, compute embeddings, match.
         
-        No external writes happen here.
+        No external writes happen here. The returned result is persisted
+        by process_batch together with the rest of the batch.
         Gracefully skips files that cannot be processed.
         """
+        # filename/extension are precomputed at ingest; build the Path only once
         source_path = Path(image["source_path"])
-        is_raw = source_path.suffix.lower() == ".arw"
+        filename = image["filename"]
+        is_raw = image["extension"] == ".arw"
         
         # Show which image is being processed
-        print(f"  📷 Processing: {source_path.name}")
+        print(f"  📷 Processing: {filename}")
         
         temp_path: Optional[Path] = None
+        hash_task: Optional[asyncio.Task] = None
         
         try:
+            # Hash on a worker thread so the full-file read overlaps with
+            # RAW conversion and face detection instead of following them
+            if not image.get("sha256"):
+                hash_task = asyncio.create_task(
+                    cached_file_hash(source_path, pending_rows=self._new_file_hashes)
+                )
+            
             # Get image for face detection
             if is_raw:
                 # Convert RAW to temp JPEG for recognition
                 try:
-                    temp_path = self.raw_engine.convert_for_recognition(source_path)
+                    loop = asyncio.get_running_loop()
+                    temp_path = await loop.run_in_executor(
+                        self._cpu_pool,
+                        convert_raw_for_recognition,
+                        source_path
+                    )
                     recognition_path = temp_path
                 except Exception as e:
                     # Gracefully skip unsupported/corrupted RAW files
                     error_msg = str(e).replace("b'", "").replace("'", "")
-                    print(f"  ⚠ Skipping {source_path.name}: {error_msg}")
-                    # Save empty result so we don't retry this file
-                    await save_image_result(
-                        image_id=image["image_id"],
-                        batch_id=batch_id,
-                        face_count=0,
-                        matched_count=0,
-                        unknown_count=0,
-                        matched_person_ids=[]
-                    )
+                    print(f"  ⚠ Skipping {filename}: {error_msg}")
+                    # Empty result is saved with the batch so we don't retry this file
                     return {
                         "image_id": image["image_id"],
                         "face_count": 0,
@@ -311,15 +406,7 @@ class BatchEngine:
                 )
             except Exception as e:
                 # Gracefully skip files that can't be read/processed
-                print(f"  ⚠ Skipping {source_path.name}: Could not process image - {e}")
-                await save_image_result(
-                    image_id=image["image_id"],
-                    batch_id=batch_id,
-                    face_count=0,
-                    matched_count=0,
-                    unknown_count=0,
-                    matched_person_ids=[]
-                )
+                print(f"  ⚠ Skipping {filename}: Could not process image - {e}")
                 return {
                     "image_id": image["image_id"],
                     "face_count": 0,
@@ -334,50 +421,46 @@ class BatchEngine:
             matched_ids = []
             unknown_count = 0
             
-            for face in faces:
-                result = await self.matcher.match(
-                    face["embedding"],
+            # GROUP MODE: fewer faces than required people can never satisfy
+            # the group, so skip the matcher entirely
+            required_set = self._required_person_ids
+            group_impossible = (
+                required_set is not None and len(faces) < len(required_set)
+            )
+            
+            if group_impossible:
+                unknown_count = len(faces)
+            else:
+                # All faces of the image are scored in one matrix product
+                results = await self.matcher.match_many(
+                    [face["embedding"] for face in faces],
                     learn_on_strict=True
                 )
-                
-                if result.is_matched:
-                    matched_ids.append(result.person_id)
-                else:
-                    unknown_count += 1
+                for result in results:
+                    if result.is_matched:
+                        matched_ids.append(result.person_id)
+                    else:
+                        unknown_count += 1
             
-            # Deduplicate matched IDs
-            matched_ids = list(set(matched_ids))
+            # Deduplicate matched IDs (order-preserving, first match wins)
+            matched_ids = list(dict.fromkeys(matched_ids))
             
             # GROUP MODE: Check if ALL selected people are present
             # If not, clear matches so image won't be routed
             group_match = False
-            if self.group_mode and self.selected_person_ids:
-                required_set = set(self.selected_person_ids)
-                if required_set.issubset(set(matched_ids)):
+            if required_set is not None:
+                if required_set.issubset(matched_ids):
                     group_match = True
                     print(f"      → GROUP MATCH: All {len(required_set)} required people found! ✓")
                 else:
                     # Not all required people present - skip routing in group mode
-                    found_count = len(required_set.intersection(set(matched_ids)))
+                    found_count = len(required_set.intersection(matched_ids))
                     print(f"      → Group: {found_count}/{len(required_set)} required people (skipping)")
                     matched_ids = []  # Clear so image won't be routed
             
-            # Compute hash if not already done
-            if not image.get("sha256"):
-                from ..db.jobs import update_image_hash
-                sha256 = compute_file_hash(source_path)
-                await update_image_hash(image["image_id"], sha256)
-                image["sha256"] = sha256
-            
-            # Save result
-            await save_image_result(
-                image_id=image["image_id"],
-                batch_id=batch_id,
-                face_count=len(faces),
-                matched_count=len(matched_ids),
-                unknown_count=unknown_count,
-                matched_person_ids=matched_ids
-            )
+            # Collect the hash started above (persisted with the batch results)
+            if hash_task is not None:
+                image["sha256"] = await hash_task
             
             # Summary for this image (non-group mode)
             if not self.group_mode:
@@ -391,6 +474,8 @@ class BatchEngine:
             return {
                 "image_id": image["image_id"],
                 "source_path": image["source_path"],
+                "filename": filename,
+                "extension": image["extension"],
                 "sha256": image["sha256"],
                 "face_count": len(faces),
                 "matched_count": len(matched_ids),
@@ -399,6 +484,13 @@ class BatchEngine:
             }
             
         finally:
+            # Don't leave the hash task dangling on skip/error paths
+            if hash_task is not None:
+                if not hash_task.done():
+                    hash_task.cancel()
+                elif not hash_task.cancelled():
+                    hash_task.exception()  # Mark any error as retrieved
+            
             # Clean up temp file if created
             if temp_path and temp_path.exists():
                 self.raw_engine.cleanup_temp_file(temp_path)
@@ -410,24 +502,54 @@ class BatchEngine:
         External writes happen here (append-only).
         """
         source_path = Path(img_result["source_path"])
-        is_raw = source_path.suffix.lower() == ".arw"
+        is_raw = img_result["extension"] == ".arw"
         
         # Generate output filename
-        original_stem = source_path.stem
+        original_stem = os.path.splitext(img_result["filename"])[0]
         file_hash = img_result["sha256"]
         
         from ..storage.paths import generate_deterministic_filename
         output_filename = generate_deterministic_filename(original_stem, file_hash)
         
+        # Idempotent: if every destination already holds this deterministic
+        # name (e.g. on resume), skip compression and routing entirely
+        group_folder = self.group_folder_name if self.group_mode else None
+        destinations = await self.routing_engine.plan_destinations(
+            batch_id,
+            output_filename,
+            matched_person_ids=img_result["matched_person_ids"],
+            group_folder_name=group_folder
+        )
+        # The output drive may be slow or external; keep the stats off the loop
+        if destinations and await asyncio.to_thread(_all_exist, destinations):
+            return {
+                "image_id": img_result["image_id"],
+                "output_filename": output_filename,
+                "routed": [],
+                "status": "skipped"
+            }
+        
         # Staging path
         staged_path = settings.staging_dir / output_filename
         
         try:
             # Compress to staging (ONCE)
             if is_raw:
-                self.raw_engine.convert_for_delivery(source_path, staged_path)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    self._cpu_pool,
+                    convert_raw_for_delivery,
+                    source_path,
+                    staged_path
+                )
             else:
-                self.compression_engine.compress(source_path, staged_path)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    self._cpu_pool,
+                    compress_image,
+                    source_path,
+                    staged_path
+                )
             
             # GROUP MODE: Route to group folder instead of individual person folders
             if self.group_mode and self.group_folder_name:
@@ -459,7 +581,7 @@ class BatchEngine:
             
         finally:
             # Clean up staging file
-            self.routing_engine.cleanup_staged_file(staged_path)
+            await asyncio.to_thread(self.routing_engine.cleanup_staged_file, staged_path)
     
     async def _commit_batch(self, batch_id: int) -> list:
         """
@@ -476,42 +598,72 @@ class BatchEngine:
         image_results = await get_image_results_for_batch(batch_id)
         images_with_matches = [r for r in image_results if r["matched_count"] > 0]
 
+        if not images_with_matches:
+            # Fast path: nothing to compress or route - one DB transaction
+            # for state + counts, and only an occasional console summary
+            await self._mark_batch_committed(
+                batch_id, job_id, batch_result_count=len(image_results)
+            )
+            self._update_progress(current_batch_state="COMMITTED")
+            if self._committed_batches % SUMMARY_EVERY_N_EMPTY_BATCHES == 0:
+                self._print_progress_summary()
+            return []
+
         commit_semaphore = asyncio.Semaphore(settings.get_worker_count())
 
         async def commit_with_semaphore(img_result):
             async with commit_semaphore:
                 return await self._commit_image(img_result, batch_id)
 
-        if images_with_matches:
-            commit_results = await asyncio.gather(*[commit_with_semaphore(r) for r in images_with_matches])
-            for commit_result in reversed(commit_results):
-                if commit_result.get("routed"):
-                    last_routed = commit_result["routed"][-1]
-                    self._update_progress(
-                        last_committed_person=last_routed.get("person_name"),
-                        last_committed_image=commit_result.get("output_filename"),
-                    )
-                    break
-        else:
-            commit_results = []
+        commit_results = await asyncio.gather(*[commit_with_semaphore(r) for r in images_with_matches])
+        for commit_result in reversed(commit_results):
+            if commit_result.get("routed"):
+                last_routed = commit_result["routed"][-1]
+                self._update_progress(
+                    last_committed_person=last_routed.get("person_name"),
+                    last_committed_image=commit_result.get("output_filename"),
+                )
+                break
 
-        await update_batch_state(batch_id, BatchState.COMMITTED)
-        await self._update_job_progress(job_id, batch_result_count=len(image_results))
+        await self._mark_batch_committed(
+            batch_id, job_id, batch_result_count=len(image_results)
+        )
         self._update_progress(current_batch_state="COMMITTED")
         self._print_progress_summary()
         return commit_results
 
-    async def _update_job_progress(self, job_id: int, batch_result_count: int | None = None) -> None:
-        """Update job progress in database. batch_result_count: for partial (terminated) batches."""
-        committed_batches = await get_committed_batch_count(job_id)
+    async def _mark_batch_committed(
+        self,
+        batch_id: int,
+        job_id: int,
+        batch_result_count: int | None = None
+    ) -> None:
+        """
+        Move a batch to COMMITTED and update job progress in one transaction.
+        
+        batch_result_count: images in this batch (for partial/terminated batches).
+        The committed batch count is kept in memory and only seeded from the DB
+        on this engine's first commit (e.g. after resume).
+        Outputs routed in the batch are flushed to disk first, so a batch is
+        never COMMITTED with its files still only in the page cache.
+        """
+        await asyncio.to_thread(self.routing_engine.finalize_batch)
+        
+        if self._committed_batches is None:
+            # Not yet counted in the DB, so include this batch
+            self._committed_batches = await get_committed_batch_count(job_id) + 1
+        else:
+            self._committed_batches += 1
+        
         batch_size = settings.atomic_batch_size
         if batch_result_count is not None:
-            processed = (committed_batches - 1) * batch_size + batch_result_count
+            processed = (self._committed_batches - 1) * batch_size + batch_result_count
         else:
-            processed = committed_batches * batch_size
+            processed = self._committed_batches * batch_size
         if processed > self.total_images:
             processed = self.total_images
-        await update_job_image_counts(job_id, self.total_images, processed)
+        
+        await commit_batch_with_counts(batch_id, job_id, self.total_images, processed)
         self.processed_images = processed
     
     def _update_progress(
@@ -524,22 +676,60 @@ class BatchEngine:
         last_committed_person: Optional[str] = None,
         last_committed_image: Optional[str] = None,
     ) -> None:
-        """Write progress state file for tracker UI."""
+        """
+        Record progress state for tracker UI.
+        
+        While a batch is streaming, the state is only marked dirty and
+        _progress_loop writes the latest snapshot at most every
+        PROGRESS_FLUSH_INTERVAL seconds. Otherwise it is written immediately.
+        """
+        self._progress_state = {
+            "current_superbatch": current_superbatch,
+            "current_batch_id": current_batch_id,
+            "current_batch_state": current_batch_state,
+            "current_image_range": current_image_range,
+            "current_image": current_image,
+            "last_committed_person": last_committed_person,
+            "last_committed_image": last_committed_image,
+        }
+        if self._progress_task is None:
+            self._flush_progress()
+        else:
+            self._progress_dirty.set()
+    
+    def _flush_progress(self) -> None:
+        """Write the latest progress snapshot to the state file."""
+        self._progress_dirty.clear()
+        if self._progress_state is None:
+            return
         self.state_writer.write_progress(
             total_images=self.total_images,
             processed_images=self.processed_images,
-            current_superbatch=current_superbatch,
-            current_batch_id=current_batch_id,
-            current_batch_state=current_batch_state,
-            current_image_range=current_image_range,
-            current_image=current_image,
-            last_committed_person=last_committed_person,
-            last_committed_image=last_committed_image,
             start_time=self.start_time,
             source_root=str(self.source_root) if self.source_root else None,
             output_root=str(self.output_root) if self.output_root else None,
+            **self._progress_state,
         )
     
+    async def _progress_loop(self) -> None:
+        """Background task: flush dirty progress state at a bounded rate."""
+        while True:
+            await self._progress_dirty.wait()
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            self._flush_progress()
+    
+    async def _stop_progress_loop(self) -> None:
+        """Cancel the progress task and write any pending state."""
+        task, self._progress_task = self._progress_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._progress_dirty.is_set():
+            self._flush_progress()
+    
     def _print_progress_summary(self) -> None:
         """Print progress summary with time estimates to console."""
         if self.total_images == 0:
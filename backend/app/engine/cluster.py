@@ -13,9 +13,13 @@ import numpy as np
 from sklearn.cluster import DBSCAN
 
 from .faces import get_face_engine
+from .ingest import walk_images
 from ..config import settings
 from ..db.jobs import get_job_config
 
+# Images per face-engine call while extracting embeddings
+EMBED_BATCH_SIZE = 8
+
 # Global state for the discovery job since it runs in the background
 # Only one discovery job can run at a time
 discovery_state = {
@@ -73,12 +77,7 @@ def _save_crop(image_path: Path, bbox: list, cluster_id: int, face_idx: int) ->
         
 def _scan_images(source_root: Path, extensions: set) -> list[Path]:
     """Recursively scan for images in the source root."""
-    images = []
-    for ext in extensions:
-        images.extend(source_root.rglob(f"*{ext}"))
-        images.extend(source_root.rglob(f"*{ext.upper()}"))
-    # Deduplicate and sort (to be safe)
-    return list(set(images))
+    return list(walk_images(source_root, extensions))
 
 
 async def run_discovery_task(sample_size: int):
@@ -128,19 +127,34 @@ async def run_discovery_task(sample_size: int):
         
         all_faces = []
         
-        for i, img_path in enumerate(sampled_images):
+        # Images go through the face engine in small groups so all faces in
+        # a group share one recognition pass
+        for start in range(0, actual_sample_size, EMBED_BATCH_SIZE):
+            chunk = sampled_images[start:start + EMBED_BATCH_SIZE]
+            
             # Update progress
-            discovery_state["processed_images"] = i + 1
-            discovery_state["progress"] = (i / actual_sample_size) * 80.0  # 80% of task is extraction
+            discovery_state["processed_images"] = start + len(chunk)
+            discovery_state["progress"] = (start / actual_sample_size) * 80.0  # 80% of task is extraction
             
+            # Run in a thread to not block event loop so API can serve status
+            # (InsightFace uses ONNXRuntime which usually releases GIL)
             try:
-                # Need to run in executor to not block event loop so API can serve status
-                # but InsightFace uses ONNXRuntime which usually releases GIL.
-                def _process():
-                    return face_engine.detect_and_embed_from_path(img_path, max_faces=10)
-                
-                faces = await asyncio.to_thread(_process)
-                
+                chunk_faces = await asyncio.to_thread(
+                    face_engine.detect_and_embed_batch, chunk, 10
+                )
+            except Exception:
+                # One unreadable file fails the whole group - retry one by one
+                chunk_faces = []
+                for img_path in chunk:
+                    try:
+                        chunk_faces.append(
+                            await asyncio.to_thread(face_engine.detect_and_embed, img_path, 10)
+                        )
+                    except Exception as e:
+                        print(f"Error processing {img_path}: {e}")
+                        chunk_faces.append([])
+            
+            for img_path, faces in zip(chunk, chunk_faces):
                 for face in faces:
                     all_faces.append({
                         "image_path": img_path,
@@ -148,9 +162,7 @@ async def run_discovery_task(sample_size: int):
                         "embedding": face["embedding"]
                     })
                     
-                discovery_state["faces_found"] = len(all_faces)
-            except Exception as e:
-                print(f"Error processing {img_path}: {e}")
+            discovery_state["faces_found"] = len(all_faces)
                 
             # Yield control so status can be polled
             await asyncio.sleep(0.01)
@@ -9,7 +9,11 @@ Output Policy (LOCKED):
 - Color space: sRGB
 - Metadata: stripped
 """
+import hashlib
 import io
+import struct
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -30,6 +34,139 @@ def _get_srgb_profile() -> ImageCms.ImageCmsProfile:
     return _srgb_profile
 
 
+# sRGB reference for _is_srgb_profile: D50-adapted colorants (rXYZ, gXYZ,
+# bXYZ as stored in ICC sRGB profiles) and the IEC 61966-2-1 transfer curve
+_SRGB_COLORANTS = {
+    b"rXYZ": (0.436066, 0.222488, 0.013916),
+    b"gXYZ": (0.385147, 0.716873, 0.097076),
+    b"bXYZ": (0.143066, 0.060608, 0.714096),
+}
+_COLORANT_TOLERANCE = 0.003
+_TRC_TOLERANCE = 0.003
+_TRC_SAMPLES = [i / 32 for i in range(33)]
+
+
+def _srgb_trc(x: float) -> float:
+    """sRGB transfer curve (encoded value -> linear)."""
+    return x / 12.92 if x <= 0.04045 else ((x + 0.055) / 1.055) ** 2.4
+
+
+def _parse_trc(tag: bytes):
+    """
+    Decode an ICC curv/para tag into a function on [0, 1].
+    
+    Returns None for anything that can't be read.
+    """
+    sig = tag[:4]
+    if sig == b"curv":
+        (count,) = struct.unpack_from(">I", tag, 8)
+        if count == 0:
+            return lambda x: x
+        if count == 1:
+            gamma = struct.unpack_from(">H", tag, 12)[0] / 256.0
+            return lambda x: x ** gamma
+        table = [v / 65535.0 for v in struct.unpack_from(f">{count}H", tag, 12)]
+        
+        def curve(x: float) -> float:
+            pos = x * (count - 1)
+            i = min(int(pos), count - 2)
+            return table[i] + (table[i + 1] - table[i]) * (pos - i)
+        return curve
+    
+    if sig == b"para":
+        (func_type,) = struct.unpack_from(">H", tag, 8)
+        n_params = {0: 1, 1: 3, 2: 4, 3: 5, 4: 7}.get(func_type)
+        if n_params is None:
+            return None
+        params = [v / 65536.0 for v in struct.unpack_from(f">{n_params}i", tag, 12)]
+        g, a, b, c, d, e, f = params + [0.0] * (7 - n_params)
+        if func_type == 0:
+            return lambda x: x ** g
+        if func_type in (1, 2):
+            offset = c if func_type == 2 else 0.0
+            return lambda x: (a * x + b) ** g + offset if a * x + b >= 0 else offset
+        return lambda x: (max(a * x + b, 0.0) ** g + e) if x >= d else (c * x + f)
+    
+    return None
+
+
+def _is_srgb_profile(icc_profile: bytes) -> bool:
+    """
+    True if an embedded ICC profile is colorimetrically sRGB.
+    
+    Compares the profile's actual colorants and per-channel tone curves
+    with sRGB, so byte-different vendor copies of the standard profile
+    match while "sRGB"-named variants with another gamma (linear sRGB,
+    custom TRC) do not. LUT-based profiles (A2B0) are never treated as
+    sRGB, since LittleCMS would use the LUT rather than the matrix/TRC.
+    Any parsing problem means "not sRGB", so the image is converted.
+    """
+    try:
+        if icc_profile[16:20] != b"RGB " or icc_profile[20:24] != b"XYZ ":
+            return False
+        (tag_count,) = struct.unpack_from(">I", icc_profile, 128)
+        tags = {}
+        for i in range(tag_count):
+            sig, offset, size = struct.unpack_from(">4sII", icc_profile, 132 + 12 * i)
+            tags[sig] = icc_profile[offset:offset + size]
+        
+        if b"A2B0" in tags:
+            return False
+        
+        for sig, expected in _SRGB_COLORANTS.items():
+            tag = tags[sig]
+            if tag[:4] != b"XYZ ":
+                return False
+            xyz = [v / 65536.0 for v in struct.unpack_from(">3i", tag, 8)]
+            if any(abs(v - ref) > _COLORANT_TOLERANCE for v, ref in zip(xyz, expected)):
+                return False
+        
+        for sig in (b"rTRC", b"gTRC", b"bTRC"):
+            curve = _parse_trc(tags[sig])
+            if curve is None:
+                return False
+            if any(abs(curve(x) - _srgb_trc(x)) > _TRC_TOLERANCE for x in _TRC_SAMPLES):
+                return False
+        return True
+    except (KeyError, struct.error, ValueError, OverflowError, ZeroDivisionError):
+        return False
+
+
+# Compiled LittleCMS transforms keyed by MD5 of the embedded ICC profile.
+# Images from the same camera share a profile, so one transform is reused
+# across the batch instead of being rebuilt per image. None marks a profile
+# that is already sRGB, for which no transform is needed.
+_TRANSFORM_CACHE_SIZE = 16
+_transform_cache: "OrderedDict[bytes, Optional[ImageCms.ImageCmsTransform]]" = OrderedDict()
+
+
+def _get_srgb_transform(icc_profile: bytes) -> Optional[ImageCms.ImageCmsTransform]:
+    """
+    Get or build an RGB→sRGB transform for an embedded ICC profile (LRU).
+    
+    Returns None when the profile is colorimetrically sRGB (e.g. the
+    "sRGB IEC61966-2.1" profile most cameras embed); see _is_srgb_profile.
+    """
+    key = hashlib.md5(icc_profile).digest()
+    if key in _transform_cache:
+        _transform_cache.move_to_end(key)
+        return _transform_cache[key]
+    
+    if _is_srgb_profile(icc_profile):
+        transform = None
+    else:
+        transform = ImageCms.buildTransform(
+            ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+            _get_srgb_profile(),
+            "RGB",
+            "RGB"
+        )
+    _transform_cache[key] = transform
+    if len(_transform_cache) > _TRANSFORM_CACHE_SIZE:
+        _transform_cache.popitem(last=False)
+    return transform
+
+
 class CompressionEngine:
     """
     Image compression with locked output policy.
@@ -73,26 +210,21 @@ class CompressionEngine:
         actual_output.parent.mkdir(parents=True, exist_ok=True)
         
         # Load image
-        with Image.open(input_path) as img:
-            # Convert to RGB if necessary (handles RGBA, P, L modes)
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            
-            # Convert to sRGB color space
-            img = self._ensure_srgb(img)
-            
-            # Resize if needed (preserve aspect ratio)
-            img = self._resize_to_max_edge(img)
-            
-            # Save as JPEG without metadata
-            img.save(
-                actual_output,
-                format="JPEG",
-                quality=self.jpeg_quality,
-                optimize=True,
-                exif=b"",  # Strip EXIF
-                icc_profile=None  # Don't embed profile (assume sRGB)
-            )
+        with Image.open(input_path) as src:
+            img = self._prepare(src)
+            try:
+                # Save as JPEG without metadata
+                img.save(
+                    actual_output,
+                    format="JPEG",
+                    quality=self.jpeg_quality,
+                    subsampling=2,  # 4:2:0
+                    exif=b"",  # Strip EXIF
+                    icc_profile=None  # Don't embed profile (assume sRGB)
+                )
+            finally:
+                if img is not src:
+                    img.close()
         
         return actual_output
     
@@ -113,21 +245,20 @@ class CompressionEngine:
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with Image.open(io.BytesIO(image_data)) as img:
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            
-            img = self._ensure_srgb(img)
-            img = self._resize_to_max_edge(img)
-            
-            img.save(
-                output_path,
-                format="JPEG",
-                quality=self.jpeg_quality,
-                optimize=True,
-                exif=b"",
-                icc_profile=None
-            )
+        with Image.open(io.BytesIO(image_data)) as src:
+            img = self._prepare(src)
+            try:
+                img.save(
+                    output_path,
+                    format="JPEG",
+                    quality=self.jpeg_quality,
+                    subsampling=2,  # 4:2:0
+                    exif=b"",
+                    icc_profile=None
+                )
+            finally:
+                if img is not src:
+                    img.close()
         
         return output_path
     
@@ -144,24 +275,53 @@ class CompressionEngine:
         """
         output_buffer = io.BytesIO()
         
-        with Image.open(io.BytesIO(image_data)) as img:
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            
-            img = self._ensure_srgb(img)
-            img = self._resize_to_max_edge(img)
-            
-            img.save(
-                output_buffer,
-                format="JPEG",
-                quality=self.jpeg_quality,
-                optimize=True,
-                exif=b"",
-                icc_profile=None
-            )
+        with Image.open(io.BytesIO(image_data)) as src:
+            img = self._prepare(src)
+            try:
+                img.save(
+                    output_buffer,
+                    format="JPEG",
+                    quality=self.jpeg_quality,
+                    subsampling=2,  # 4:2:0
+                    exif=b"",
+                    icc_profile=None
+                )
+            finally:
+                if img is not src:
+                    img.close()
         
         return output_buffer.getvalue()
     
+    def _prepare(self, src: Image.Image) -> Image.Image:
+        """
+        Decode, convert to RGB/sRGB and resize an opened image.
+        
+        Each step may return a new full-size image; intermediates are
+        closed as soon as the next one exists so only one or two decoded
+        buffers are alive per call. The caller closes src (via its with
+        block) and the returned image if it is not src.
+        """
+        # Decode JPEGs directly at a reduced scale when possible
+        self._draft_to_max_edge(src)
+        
+        img = src
+        for step in (
+            self._to_rgb,               # handles RGBA, P, L modes
+            self._ensure_srgb,          # convert to sRGB color space
+            self._resize_to_max_edge,   # preserve aspect ratio
+        ):
+            result = step(img)
+            if result is not img and img is not src:
+                img.close()
+            img = result
+        return img
+    
+    def _to_rgb(self, img: Image.Image) -> Image.Image:
+        """Convert to RGB if necessary."""
+        if img.mode != "RGB":
+            return img.convert("RGB")
+        return img
+    
     def _ensure_srgb(self, img: Image.Image) -> Image.Image:
         """
         Convert image to sRGB color space if it has an embedded profile.
@@ -169,24 +329,33 @@ class CompressionEngine:
         try:
             # Check if image has an ICC profile
             if "icc_profile" in img.info and img.info["icc_profile"]:
-                # Convert from embedded profile to sRGB
-                input_profile = ImageCms.ImageCmsProfile(
-                    io.BytesIO(img.info["icc_profile"])
-                )
-                output_profile = _get_srgb_profile()
-                
-                img = ImageCms.profileToProfile(
-                    img,
-                    input_profile,
-                    output_profile,
-                    outputMode="RGB"
-                )
+                # Convert from embedded profile to sRGB (cached transform);
+                # already-sRGB profiles pass through untouched
+                transform = _get_srgb_transform(img.info["icc_profile"])
+                if transform is not None:
+                    img = ImageCms.applyTransform(img, transform)
         except Exception:
             # If color conversion fails, continue with original
             pass
         
         return img
     
+    def _draft_to_max_edge(self, img: Image.Image) -> None:
+        """
+        Configure JPEG decoding to use libjpeg's DCT scaling (1/2, 1/4, 1/8).
+        
+        The chosen scale is the smallest that still covers the final output
+        size, so the LANCZOS resize afterwards only refines it. Must be called
+        before the image data is loaded; no-op for non-JPEG images.
+        """
+        if img.format != "JPEG":
+            return
+        
+        width, height = img.size
+        scale = self.max_long_edge / max(width, height)
+        if scale < 1:
+            img.draft("RGB", (int(width * scale), int(height * scale)))
+    
     def _resize_to_max_edge(self, img: Image.Image) -> Image.Image:
         """
         Resize image so long edge is at most max_long_edge.
@@ -204,8 +373,13 @@ class CompressionEngine:
         new_width = int(width * scale)
         new_height = int(height * scale)
         
-        # Use high-quality resampling
-        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Use high-quality resampling; reducing_gap first shrinks by an integer
+        # box factor so LANCZOS runs on far fewer pixels (visually identical)
+        return img.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=3.0
+        )
     
     def get_output_size(self, input_path: Path) -> tuple[int, int]:
         """
@@ -223,6 +397,12 @@ class CompressionEngine:
             return (int(width * scale), int(height * scale))
 
 
+@lru_cache(maxsize=1)
+def get_compression_engine() -> CompressionEngine:
+    """Get the shared compression engine (stateless, safe across threads)."""
+    return CompressionEngine()
+
+
 def compress_image(input_path: Path, output_path: Path) -> Path:
     """
     Convenience function to compress a single image.
@@ -234,6 +414,5 @@ def compress_image(input_path: Path, output_path: Path) -> Path:
     Returns:
         Path where compressed image was written
     """
-    engine = CompressionEngine()
-    return engine.compress(input_path, output_path)
+    return get_compression_engine().compress(input_path, output_path)
 
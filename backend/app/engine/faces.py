@@ -3,13 +3,17 @@ Face detection and embedding engine.
 Uses InsightFace with ONNX Runtime (CPU) for offline face recognition.
 """
 import io
+import os
+import cv2
 import numpy as np
 from pathlib import Path
 from typing import Optional
 
 from PIL import Image
 import insightface
+import onnxruntime as ort
 from insightface.app import FaceAnalysis
+from insightface.utils import face_align
 
 from ..config import settings
 
@@ -71,10 +75,67 @@ class FaceEngine:
         # Using 640 for good balance of speed and accuracy
         self.app.prepare(ctx_id=-1, det_size=(640, 640))
         
+        if self.active_provider == 'CPUExecutionProvider':
+            self._tune_cpu_sessions()
+        
         FaceEngine._initialized = True
         provider_name = self.active_provider.replace('ExecutionProvider', '')
         print(f"Face engine initialized ({provider_name} mode)")
     
+    def _tune_cpu_sessions(self) -> None:
+        """
+        Rebuild the detection/recognition ONNX sessions with explicit options.
+        
+        FaceAnalysis creates sessions with default options, where each
+        session uses every core for intra-op parallelism. The batch engine
+        runs up to get_worker_count() inferences at once, so the cores are
+        split between them instead of oversubscribing the CPU.
+        """
+        worker_count = settings.get_worker_count() if settings.enable_parallel_processing else 1
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.intra_op_num_threads = max(1, (os.cpu_count() or 4) // worker_count)
+        
+        rec_model = self.app.models["recognition"]
+        for model, model_file in (
+            (self.app.det_model, self.app.det_model.model_file),
+            (rec_model, self._recognition_model_file(rec_model.model_file)),
+        ):
+            model.session = ort.InferenceSession(
+                model_file,
+                sess_options=opts,
+                providers=['CPUExecutionProvider']
+            )
+    
+    def _recognition_model_file(self, fp32_file: str) -> str:
+        """
+        Recognition model to load on CPU.
+        
+        With use_quantized_recognition, the FP32 ArcFace model is dynamically
+        quantized to int8 once and cached in models_dir/buffalo_l_int8 (kept
+        out of the buffalo_l folder, which FaceAnalysis loads wholesale).
+        Detection always stays FP32. Falls back to FP32 if quantization fails.
+        """
+        if not settings.use_quantized_recognition:
+            return fp32_file
+        
+        fp32_path = Path(fp32_file)
+        int8_path = settings.models_dir / "buffalo_l_int8" / fp32_path.name
+        if not int8_path.exists():
+            try:
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                
+                int8_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = int8_path.with_suffix(".tmp")
+                quantize_dynamic(str(fp32_path), str(temp_path), weight_type=QuantType.QInt8)
+                temp_path.replace(int8_path)
+            except Exception as e:
+                print(f"Recognition model quantization failed, using FP32: {e}")
+                return fp32_file
+        
+        return str(int8_path)
+    
     def detect_and_embed(
         self,
         image_data: bytes | np.ndarray | Path,
@@ -94,29 +155,80 @@ class FaceEngine:
             - det_score: detection confidence
             - landmark: facial landmarks
         """
-        # Load image as numpy array (BGR format for InsightFace)
-        img = self._load_image(image_data)
+        return self.detect_and_embed_batch([image_data], max_faces=max_faces)[0]
+    
+    def detect_and_embed_batch(
+        self,
+        images: list[bytes | np.ndarray | Path],
+        max_faces: int = 100
+    ) -> list[list[dict]]:
+        """
+        Detect faces in several images and embed all of them in one pass.
         
-        # Detect faces
-        faces = self.app.get(img, max_num=max_faces)
+        Detection runs per image (the detector input is image-sized), but
+        every aligned face crop across all images goes through the ArcFace
+        model as a single (M, 3, 112, 112) batch instead of one call per face.
+        Only the detection and recognition models are run; the attribute and
+        dense-landmark models bundled with buffalo_l are not needed here.
+        Faces smaller than settings.min_face_area_px are dropped before
+        recognition.
         
-        results = []
-        for face in faces:
-            results.append({
-                "embedding": face.embedding,  # 512-dim float32
-                "bbox": face.bbox.tolist(),
-                "det_score": float(face.det_score),
-                "landmark": face.landmark.tolist() if face.landmark is not None else None
-            })
+        Args:
+            images: Images as bytes, numpy arrays (BGR), or file paths
+            max_faces: Maximum number of faces to detect per image
+        
+        Returns:
+            One list of face dictionaries per input image, in input order
+            (same keys as detect_and_embed)
+        """
+        rec_model = self.app.models["recognition"]
+        min_area = settings.min_face_area_px
+        
+        results: list[list[dict]] = []
+        crops: list[np.ndarray] = []
+        for image_data in images:
+            # Load image as numpy array (BGR format for InsightFace)
+            img = self._load_image(image_data)
+            
+            # Detect faces
+            bboxes, kpss = self.app.det_model.detect(
+                img, max_num=max_faces, metric="default"
+            )
+            
+            faces = []
+            for i in range(bboxes.shape[0]):
+                x1, y1, x2, y2 = bboxes[i, 0:4]
+                if (x2 - x1) * (y2 - y1) < min_area:
+                    continue
+                kps = kpss[i] if kpss is not None else None
+                crops.append(
+                    face_align.norm_crop(img, landmark=kps, image_size=rec_model.input_size[0])
+                )
+                faces.append({
+                    "embedding": None,  # filled from the batched pass below
+                    "bbox": bboxes[i, 0:4].tolist(),
+                    "det_score": float(bboxes[i, 4]),
+                    "landmark": kps.tolist() if kps is not None else None
+                })
+            results.append(faces)
+        
+        if crops:
+            # One recognition call for every face in every image
+            embeddings = rec_model.get_feat(crops)  # (M, 512) float32
+            row = 0
+            for faces in results:
+                for face in faces:
+                    face["embedding"] = embeddings[row]
+                    row += 1
         
         return results
     
-    def detect_and_embed_from_path(self, image_path: Path) -> list[dict]:
+    def detect_and_embed_from_path(self, image_path: Path, max_faces: int = 100) -> list[dict]:
         """
         Detect faces from an image file path.
         Convenience method that handles file reading.
         """
-        return self.detect_and_embed(image_path)
+        return self.detect_and_embed(image_path, max_faces=max_faces)
     
     def _load_image(self, image_data: bytes | np.ndarray | Path) -> np.ndarray:
         """
@@ -132,6 +244,17 @@ class FaceEngine:
             # Load from file path
             image_data = image_data.read_bytes()
         
+        if image_data[:3] == b"\xff\xd8\xff":
+            # JPEG: libjpeg-turbo via OpenCV decodes straight to contiguous
+            # BGR. EXIF orientation is ignored to match the PIL path (and the
+            # bbox coordinates used for thumbnails).
+            bgr_array = cv2.imdecode(
+                np.frombuffer(image_data, np.uint8),
+                cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+            )
+            if bgr_array is not None:
+                return bgr_array
+        
         # Load from bytes using PIL
         image = Image.open(io.BytesIO(image_data))
         
@@ -139,10 +262,11 @@ class FaceEngine:
         if image.mode != "RGB":
             image = image.convert("RGB")
         
-        rgb_array = np.array(image)
+        rgb_array = np.asarray(image)
         
-        # Convert RGB to BGR for InsightFace
-        bgr_array = rgb_array[:, :, ::-1]
+        # Convert RGB to BGR for InsightFace as one contiguous copy (a
+        # negative-stride view would be copied again by cv2/ONNX Runtime)
+        bgr_array = np.ascontiguousarray(rgb_array[:, :, ::-1])
         
         return bgr_array
     
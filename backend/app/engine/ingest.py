@@ -2,9 +2,13 @@
 Image ingestion and batching engine.
 Handles deterministic discovery, SHA-256 hashing, and batch creation.
 """
+import asyncio
 import hashlib
+import json
+import os
+import time
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterable
 
 from ..config import settings
 from ..db.jobs import (
@@ -14,8 +18,115 @@ from ..db.jobs import (
     get_active_job,
     update_job_image_counts,
     get_image_count,
+    cached_file_hash,
+    save_file_hashes,
 )
-from ..storage.paths import compute_file_hash
+
+
+# Files hashed concurrently when ingest computes hashes up front
+HASH_CONCURRENCY = 4
+
+
+def walk_images(source_root: Path, extensions: Iterable[str]) -> Generator[Path, None, None]:
+    """
+    Yield every file under source_root whose extension is in extensions.
+    
+    A single os.scandir traversal; extensions match case-insensitively.
+    scandir returns the entry type with the listing, so only directories
+    cost an extra lookup. Symlinked directories are not followed.
+    """
+    exts = {e.lower() for e in extensions}
+    stack = [str(source_root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # Don't descend into symlinked directories (rglob didn't);
+                    # a link back up the tree would repeat every image under it
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in exts and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            # Unreadable directory - skip it, like rglob did
+            continue
+
+
+# A cached directory listing is only trusted if it was taken this long after
+# the directory's mtime; coarse timestamps (2 s on FAT/exFAT) could otherwise
+# hide an entry added in the same tick as the scan
+INDEX_RACY_NS = 3_000_000_000
+
+# Bumped when the index layout or what it records changes; an index written
+# by another version is discarded. 2: symlinked directories are no longer
+# listed (v1 indexes could hold a symlink loop).
+INDEX_VERSION = 2
+
+
+def walk_images_indexed(
+    source_root: Path,
+    extensions: Iterable[str],
+    index_path: Path
+) -> list[Path]:
+    """
+    Same result as walk_images, reusing unchanged directory listings.
+    
+    The index maps each directory to its mtime and the subdirectories and
+    matching files it contained. Adding, removing or renaming an entry
+    updates the directory's mtime, so a directory whose mtime still matches
+    costs one stat instead of a full listing. Directories that changed (or
+    are new) are scanned again. The refreshed index is written back.
+    """
+    exts = sorted({e.lower() for e in extensions})
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION and index.get("extensions") == exts:
+            cached_dirs = index["dirs"]
+        else:
+            cached_dirs = {}
+    except (OSError, ValueError, KeyError, TypeError):
+        cached_dirs = {}
+    
+    found: list[Path] = []
+    new_dirs: dict[str, dict] = {}
+    stack = [str(source_root)]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+            listing = cached_dirs.get(dir_path)
+            if (
+                listing is None
+                or listing["mtime_ns"] != mtime_ns
+                or listing["scanned_ns"] - mtime_ns < INDEX_RACY_NS
+            ):
+                listing = {"mtime_ns": mtime_ns, "scanned_ns": time.time_ns(), "dirs": [], "files": []}
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            listing["dirs"].append(entry.name)
+                        elif os.path.splitext(entry.name)[1].lower() in exts and entry.is_file():
+                            listing["files"].append(entry.name)
+        except OSError:
+            # Unreadable directory - skip it, like walk_images
+            continue
+        
+        new_dirs[dir_path] = listing
+        stack.extend(os.path.join(dir_path, name) for name in listing["dirs"])
+        found.extend(Path(os.path.join(dir_path, name)) for name in listing["files"])
+    
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = index_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "extensions": exts, "dirs": new_dirs}, f)
+        temp_path.replace(index_path)
+    except OSError:
+        # The index is only a cache
+        pass
+    
+    return found
 
 
 def _format_priority(ext: str) -> int:
@@ -59,6 +170,9 @@ class ImageDiscovery:
     def __init__(self, source_root: Path):
         self.source_root = source_root
         self.supported_extensions = settings.supported_extensions
+        # Per-source discovery index, so warm re-runs skip unchanged directories
+        root_key = hashlib.sha1(str(source_root.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.index_path = settings.cache_dir / f"discover_{root_key}.json"
     
     def discover(self) -> Generator[dict, None, None]:
         """
@@ -69,16 +183,12 @@ class ImageDiscovery:
         
         Images are yielded in deterministic order (sorted by full path).
         """
-        # Collect all image paths
-        image_paths = []
-        
-        for ext in self.supported_extensions:
-            # Case-insensitive matching
-            image_paths.extend(self.source_root.rglob(f"*{ext}"))
-            image_paths.extend(self.source_root.rglob(f"*{ext.upper()}"))
+        # Collect all image paths in one traversal (case-insensitive matching),
+        # re-listing only directories that changed since the last run
+        image_paths = walk_images_indexed(
+            self.source_root, self.supported_extensions, self.index_path
+        )
         
-        # Sort for deterministic ordering
-        image_paths = sorted(set(image_paths))
         # If both pic1.jpg and pic1.arw exist, keep only the faster one (.jpg/.jpeg over .arw)
         image_paths = _one_per_stem_prefer_fast(image_paths)
         
@@ -93,11 +203,7 @@ class ImageDiscovery:
     
     def count(self) -> int:
         """Count total images without loading all paths."""
-        count = 0
-        for ext in self.supported_extensions:
-            count += len(list(self.source_root.rglob(f"*{ext}")))
-            count += len(list(self.source_root.rglob(f"*{ext.upper()}")))
-        return count
+        return sum(1 for _ in walk_images(self.source_root, self.supported_extensions))
 
 
 class IngestEngine:
@@ -176,28 +282,42 @@ class IngestEngine:
         else:
             image_stream = list(self.discovery.discover())
         
-        # Catalog images
-        images = []
-        for image_info in image_stream:
-            if compute_hashes:
+        # Catalog images in chunks of 1000: hashing of the next chunk
+        # (file reads + DB lookups only) overlaps with the DB insert of the
+        # previous one, which is the only writer while it runs
+        hash_slots = asyncio.Semaphore(HASH_CONCURRENCY)
+        
+        async def hash_one(image_info: dict, new_hashes: list[tuple]) -> None:
+            # file_digest releases the GIL, so a few files hash in parallel
+            # and the drive always has a read queued
+            async with hash_slots:
                 try:
-                    image_info["sha256"] = compute_file_hash(
-                        Path(image_info["source_path"])
+                    image_info["sha256"] = await cached_file_hash(
+                        Path(image_info["source_path"]), pending_rows=new_hashes
                     )
                 except Exception as e:
                     print(f"Warning: Could not hash {image_info['source_path']}: {e}")
                     image_info["sha256"] = None
-            
-            images.append(image_info)
-            
-            # Batch insert every 1000 images for efficiency
-            if len(images) >= 1000:
-                await add_images_batch(job_id, images)
-                images = []
         
-        # Insert remaining images
-        if images:
+        async def insert_chunk(images: list[dict], new_hashes: list[tuple]) -> None:
             await add_images_batch(job_id, images)
+            await save_file_hashes(new_hashes)
+        
+        insert_task: asyncio.Task | None = None
+        try:
+            for start in range(0, len(image_stream), 1000):
+                images = image_stream[start:start + 1000]
+                new_hashes: list[tuple] = []
+                if compute_hashes:
+                    await asyncio.gather(*[hash_one(info, new_hashes) for info in images])
+                if insert_task is not None:
+                    await insert_task
+                insert_task = asyncio.create_task(insert_chunk(images, new_hashes))
+            if insert_task is not None:
+                await insert_task
+        finally:
+            if insert_task is not None and not insert_task.done():
+                insert_task.cancel()
         
         # Get total count
         image_count = await get_image_count(job_id)
@@ -13,20 +13,33 @@ Matching policy:
 
 Note: Thresholds updated for normalized embeddings (was 0.5/0.6 which
 is too strict for Euclidean distance on unit vectors).
+
+On unit vectors d² = 2 - 2·cos, so the thresholds are applied as cosine
+similarity (strict ≥ 0.68, loose ≥ 0.50) straight from the dot product.
+Reported distances remain Euclidean.
 """
 import numpy as np
 import asyncio
 from typing import Optional
 
 from ..config import settings
+from ..utils.logger import get_logger
 from ..db.registry import (
     get_all_centroids,
-    add_person_embedding,
+    get_centroid,
+    add_person_embeddings,
     get_person_embeddings,
+    get_registry_version,
     normalize_embedding,
 )
 
 
+logger = get_logger("matcher")
+
+# Match outcome by number of thresholds passed
+MATCH_TYPES = ("unknown", "loose", "strict")
+
+
 class MatchResult:
     """Result of matching a face embedding against the registry."""
     
@@ -94,14 +107,34 @@ class FaceMatcher:
         self.threshold_loose = 1.00   # Lower confidence match
         self._centroids_cache: Optional[list[dict]] = None
         self._centroid_matrix: Optional[np.ndarray] = None  # (N, 512) matrix for vectorized matching
+        self._registry_version: Optional[int] = None  # Version the cache was built from
         self._selected_person_ids: Optional[set[int]] = (
             set(selected_person_ids) if selected_person_ids else None
         )
+        # Strict matches waiting to be learned: (centroid index, person_id, embedding)
+        self._learn_queue: list[tuple[int, int, np.ndarray]] = []
         # Lock for thread-safe embedding learning (prevents nested transactions)
         self._learn_lock = asyncio.Lock()
     
+    @property
+    def cos_strict(self) -> float:
+        """STRICT threshold as cosine similarity (d ≤ t  ⇔  sim ≥ 1 - t²/2)."""
+        return 1.0 - self.threshold_strict ** 2 / 2.0
+    
+    @property
+    def cos_loose(self) -> float:
+        """LOOSE threshold as cosine similarity."""
+        return 1.0 - self.threshold_loose ** 2 / 2.0
+    
     async def refresh_centroids(self) -> None:
-        """Refresh the centroids cache from database, filtering by selected persons."""
+        """
+        Refresh the centroids cache from database, filtering by selected persons.
+        No-op when the registry has not changed since the last refresh.
+        """
+        version = await get_registry_version()
+        if self._centroids_cache is not None and version == self._registry_version:
+            return
+        
         all_centroids = await get_all_centroids()
         
         # Filter by selected persons if specified
@@ -110,18 +143,65 @@ class FaceMatcher:
                 c for c in all_centroids 
                 if c["person_id"] in self._selected_person_ids
             ]
-            print(f"  Matching against {len(self._centroids_cache)} selected person(s)")
+            logger.info("  Matching against %d selected person(s)", len(self._centroids_cache))
         else:
             self._centroids_cache = all_centroids
-            print(f"  Matching against all {len(self._centroids_cache)} person(s)")
+            logger.info("  Matching against all %d person(s)", len(self._centroids_cache))
         
         # Pre-build centroid matrix for vectorized distance computation
+        # (float32, C-contiguous so the similarity product is a single BLAS call)
         if self._centroids_cache:
-            self._centroid_matrix = np.array(
-                [c["centroid"] for c in self._centroids_cache]
+            self._centroid_matrix = np.ascontiguousarray(
+                np.stack([c["centroid"] for c in self._centroids_cache]),
+                dtype=np.float32
             )
         else:
             self._centroid_matrix = None
+        
+        self._registry_version = version
+    
+    async def _refresh_learned_centroid(self, idx: int, person_id: int) -> None:
+        """
+        Update one cached centroid after learning an embedding for it.
+        
+        Learning bumps the registry version exactly once (the centroid
+        upsert). If the version moved by anything else, or the cache was
+        rebuilt since idx was computed, the whole cache is reloaded instead.
+        """
+        version = await get_registry_version()
+        centroid = await get_centroid(person_id)
+        if (
+            centroid is None
+            or version != self._registry_version + 1
+            or idx >= len(self._centroids_cache)
+            or self._centroids_cache[idx]["person_id"] != person_id
+        ):
+            await self.refresh_centroids()
+            return
+        
+        self._centroids_cache[idx]["centroid"] = centroid
+        self._centroid_matrix[idx] = centroid
+        self._registry_version = version
+    
+    def nearest_centroids(self, embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest centroid for each of a batch of normalized embeddings.
+        
+        Centroids and embeddings are unit vectors, so Euclidean distance
+        follows from the inner product: d² = 2 - 2·(e·c). One (M, 512) x
+        (512, N) matrix product replaces M separate distance computations.
+        
+        Args:
+            embeddings: (M, 512) array of normalized embeddings
+        
+        Returns:
+            Tuple of (best centroid index per row, Euclidean distance per row)
+        """
+        sims = embeddings.astype(np.float32, copy=False) @ self._centroid_matrix.T
+        best_idx = np.argmax(sims, axis=1)
+        best_sim = sims[np.arange(sims.shape[0]), best_idx]
+        distances = np.sqrt(np.maximum(0.0, 2.0 - 2.0 * best_sim))
+        return best_idx, distances
     
     async def match(
         self,
@@ -133,7 +213,8 @@ class FaceMatcher:
         
         Args:
             embedding: 512-dim face embedding
-            learn_on_strict: If True and match is STRICT, add embedding to person
+            learn_on_strict: If True and match is STRICT, queue embedding to be
+                             added to the person on the next flush_learn()
         
         Returns:
             MatchResult with match details
@@ -156,57 +237,83 @@ class FaceMatcher:
         # Centroids are already normalized when stored
         embedding_normalized = normalize_embedding(embedding)
         
-        # Vectorized distance computation against all centroids at once
-        diffs = self._centroid_matrix - embedding_normalized
-        distances = np.linalg.norm(diffs, axis=1)
-        best_idx = int(np.argmin(distances))
-        min_dist = float(distances[best_idx])
-        best_match = self._centroids_cache[best_idx]
+        # Single GEMV against all centroids; thresholds are compared in
+        # cosine space, the Euclidean distance is only derived for reporting
+        sims = self._centroid_matrix @ embedding_normalized.astype(np.float32, copy=False)
+        best_idx = np.argmax(sims, keepdims=True)
+        result = self._classify(best_idx, sims[best_idx])[0]
         
-        # DEBUG: Log match distances (for normalized embeddings, range 0-2)
-        print(f"  [MATCH] {best_match['name']}: dist={min_dist:.3f} (strict<{self.threshold_strict}, loose<{self.threshold_loose})", end="")
-        if min_dist > self.threshold_loose:
-            print(f" → NO MATCH")
-        elif min_dist > self.threshold_strict:
-            print(f" → LOOSE MATCH ✓")
-        else:
-            print(f" → STRICT MATCH ✓✓")
+        # Queue this embedding for learning (adds to person's collection)
+        if learn_on_strict and result.match_type == "strict":
+            self._learn_queue.append((int(best_idx[0]), result.person_id, embedding))
         
-        # Apply thresholds
-        if min_dist <= self.threshold_strict:
-            match_type = "strict"
-            
-            # Learn this embedding (adds to person's collection)
-            # Use lock to prevent concurrent database transactions
-            if learn_on_strict:
-                async with self._learn_lock:
-                    await add_person_embedding(
-                        best_match["person_id"],
-                        embedding,
-                        source_type="learned"
-                    )
-                    # Refresh centroids since we added an embedding
-                    await self.refresh_centroids()
+        return result
+    
+    def _classify(self, best_idx: np.ndarray, best_sim: np.ndarray) -> list[MatchResult]:
+        """
+        Apply the thresholds to each face's best centroid similarity.
+        
+        Both thresholds are compared for all rows at once; the sum of the two
+        comparisons indexes MATCH_TYPES (0 = unknown, 1 = loose, 2 = strict).
+        """
+        codes = (best_sim >= self.cos_loose).astype(np.intp) + (best_sim >= self.cos_strict)
+        distances = np.sqrt(np.maximum(0.0, 2.0 - 2.0 * best_sim))
+        
+        results = []
+        for idx, code, min_dist in zip(best_idx.tolist(), codes.tolist(), distances.tolist()):
+            best_match = self._centroids_cache[idx]
+            match_type = MATCH_TYPES[code]
             
-        elif min_dist <= self.threshold_loose:
-            match_type = "loose"
-        else:
-            # Unknown - no match
-            return MatchResult(
-                person_id=None,
-                name=None,
-                output_folder_rel=None,
-                distance=min_dist,
-                match_type="unknown"
+            # DEBUG: Log match distances (for normalized embeddings, range 0-2);
+            # arguments are only formatted when debug logging is enabled
+            logger.debug(
+                "  [MATCH] %s: dist=%.3f (strict<%s, loose<%s) → %s",
+                best_match["name"], min_dist, self.threshold_strict,
+                self.threshold_loose, match_type.upper()
             )
+            
+            if code:
+                results.append(MatchResult(
+                    person_id=best_match["person_id"],
+                    name=best_match["name"],
+                    output_folder_rel=best_match["output_folder_rel"],
+                    distance=min_dist,
+                    match_type=match_type
+                ))
+            else:
+                # Unknown - no match
+                results.append(MatchResult(
+                    person_id=None,
+                    name=None,
+                    output_folder_rel=None,
+                    distance=min_dist,
+                    match_type="unknown"
+                ))
+        return results
+    
+    async def flush_learn(self) -> None:
+        """
+        Write queued strict-match embeddings to the registry.
         
-        return MatchResult(
-            person_id=best_match["person_id"],
-            name=best_match["name"],
-            output_folder_rel=best_match["output_folder_rel"],
-            distance=min_dist,
-            match_type=match_type
-        )
+        One transaction per person (insert all, trim, recompute centroid
+        once) instead of one per face, then the cached centroids of those
+        persons are patched.
+        """
+        # Use lock to prevent concurrent database transactions
+        async with self._learn_lock:
+            queued, self._learn_queue = self._learn_queue, []
+            by_person: dict[int, tuple[int, list[np.ndarray]]] = {}
+            for idx, person_id, embedding in queued:
+                by_person.setdefault(person_id, (idx, []))[1].append(embedding)
+            
+            for person_id, (idx, embeddings) in by_person.items():
+                await add_person_embeddings(
+                    person_id,
+                    embeddings,
+                    source_type="learned"
+                )
+                # Patch just this person's centroid in the cache
+                await self._refresh_learned_centroid(idx, person_id)
     
     async def match_many(
         self,
@@ -216,17 +323,55 @@ class FaceMatcher:
         """
         Match multiple embeddings against the registry.
         
+        All embeddings are scored in one (B, 512) x (512, N) matrix product
+        against the current centroids. Strict matches are queued for
+        learning and only affect matching after the next flush_learn().
+        
         Args:
             embeddings: List of face embeddings
-            learn_on_strict: If True, learn from strict matches
+            learn_on_strict: If True, queue strict matches for learning
         
         Returns:
             List of MatchResults in same order as input
         """
-        results = []
-        for embedding in embeddings:
-            result = await self.match(embedding, learn_on_strict)
-            results.append(result)
+        if not embeddings:
+            return []
+        
+        # Ensure centroids are loaded
+        if self._centroids_cache is None:
+            await self.refresh_centroids()
+        
+        # No persons registered
+        if not self._centroids_cache:
+            return [
+                MatchResult(
+                    person_id=None,
+                    name=None,
+                    output_folder_rel=None,
+                    distance=float("inf"),
+                    match_type="unknown"
+                )
+                for _ in embeddings
+            ]
+        
+        batch = np.stack(embeddings).astype(np.float32)
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        batch /= norms
+        
+        sims = batch @ self._centroid_matrix.T
+        best_idx = sims.argmax(axis=1)
+        best_sim = sims[np.arange(len(embeddings)), best_idx]
+        
+        results = self._classify(best_idx, best_sim)
+        
+        if learn_on_strict:
+            self._learn_queue.extend(
+                (int(idx), result.person_id, embedding)
+                for idx, embedding, result in zip(best_idx, embeddings, results)
+                if result.match_type == "strict"
+            )
+        
         return results
     
     async def match_no_learn(self, embedding: np.ndarray) -> MatchResult:
@@ -256,13 +401,13 @@ async def match_faces_for_image(
     matched_ids = set()
     unknown_count = 0
     
-    for embedding in face_embeddings:
-        result = await matcher.match(embedding, learn_on_strict=True)
-        
+    for result in await matcher.match_many(face_embeddings, learn_on_strict=True):
         if result.is_matched:
             matched_ids.add(result.person_id)
         else:
             unknown_count += 1
     
+    await matcher.flush_learn()
+    
     return list(matched_ids), unknown_count
 
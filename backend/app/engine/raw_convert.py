@@ -13,6 +13,7 @@ Flow:
 5. For delivery: re-read ARW and compress to deliverable JPEG
 """
 import uuid
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -60,21 +61,33 @@ class RawConversionEngine:
         # Read RAW file
         with rawpy.imread(str(raw_path)) as raw:
             # Post-process to get RGB image
-            # Use camera white balance and auto brightness
+            # Use camera white balance and auto brightness. half_size merges
+            # each 2x2 Bayer block into one pixel instead of demosaicing:
+            # ~4x less work, and half sensor resolution is still above the
+            # 2048px recognition size for any modern body
             rgb = raw.postprocess(
                 use_camera_wb=True,
                 no_auto_bright=False,
-                output_bps=8
+                output_bps=8,
+                half_size=True
             )
         
-        # Convert to PIL Image for resize
+        # Convert to PIL Image for resize; fromarray copies the pixels into
+        # Pillow's own storage, so the array can be dropped right away
         img = Image.fromarray(rgb)
+        del rgb
         
         if resize:
-            img = self._resize_to_max_edge(img)
+            resized = self._resize_to_max_edge(img)
+            if resized is not img:
+                img.close()
+            img = resized
         
         # Save as JPEG
-        img.save(temp_path, format="JPEG", quality=90)
+        try:
+            img.save(temp_path, format="JPEG", quality=90)
+        finally:
+            img.close()
         
         return temp_path
     
@@ -121,12 +134,12 @@ class RawConversionEngine:
         # Resize to max edge
         img = self._resize_to_max_edge(img)
         
-        # Save as optimized JPEG
+        # Save as JPEG
         img.save(
             output_path,
             format="JPEG",
             quality=settings.output_jpeg_quality,
-            optimize=True
+            subsampling=2  # 4:2:0
         )
         
         return output_path
@@ -143,7 +156,11 @@ class RawConversionEngine:
         new_width = int(width * scale)
         new_height = int(height * scale)
         
-        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        return img.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=3.0
+        )
     
     @staticmethod
     def is_raw_file(path: Path) -> bool:
@@ -162,20 +179,24 @@ class RawConversionEngine:
             pass
 
 
+@lru_cache(maxsize=1)
+def get_raw_engine() -> RawConversionEngine:
+    """Get the shared RAW conversion engine (stateless, safe across threads)."""
+    return RawConversionEngine()
+
+
 def convert_raw_for_recognition(raw_path: Path) -> Path:
     """
     Convenience function to convert RAW for face recognition.
     
     Returns path to temporary JPEG that must be deleted after use.
     """
-    engine = RawConversionEngine()
-    return engine.convert_for_recognition(raw_path)
+    return get_raw_engine().convert_for_recognition(raw_path)
 
 
 def convert_raw_for_delivery(raw_path: Path, output_path: Path) -> Path:
     """
     Convenience function to convert RAW to deliverable JPEG.
     """
-    engine = RawConversionEngine()
-    return engine.convert_for_delivery(raw_path, output_path)
+    return get_raw_engine().convert_for_delivery(raw_path, output_path)
 
@@ -8,7 +8,14 @@ Routing Policy:
 - Append-only: never overwrite existing files
 - Idempotent: deterministic filename + skip if exists
 """
-import shutil
+import asyncio
+import ctypes
+import errno
+import io
+import os
+import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -17,13 +24,131 @@ from ..storage.paths import generate_deterministic_filename
 from ..db.registry import get_person_by_id
 
 
+# Chunk size for the plain read/write copy fallback
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Per-thread copy buffers (routing copies run in worker threads)
+_copy_buffers = threading.local()
+
+# errnos meaning hard links can't be used between staging and the output
+# folder (other device, or the filesystem refuses links); only these turn
+# the link path off, anything else is a real error for that file
+_LINK_UNSUPPORTED = frozenset({errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP})
+
+# errnos meaning O_TMPFILE isn't supported on this filesystem/kernel (as
+# opposed to a transient failure); only these turn the tmpfile path off
+_TMPFILE_UNSUPPORTED = frozenset({errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL})
+
+# errnos from linkat via /proc/self/fd meaning that route is unavailable
+# (/proc not mounted, or the magic link refused)
+_PROC_LINK_UNAVAILABLE = frozenset({errno.ENOENT, errno.EXDEV})
+
+
+def _copy_fd(src_fd: int, dst_fd: int, size: int) -> None:
+    """
+    Copy size bytes from src_fd to dst_fd, starting at both current offsets.
+    
+    Prefers in-kernel copies: copy_file_range (Linux, can reflink or
+    copy server-side), then sendfile, then a plain read/write loop. Each
+    step picks up where the previous one stopped if it is unsupported for
+    this pair of files (EXDEV, ENOSYS, EINVAL, ...).
+    """
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < size:
+                n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            pass
+    
+    if copied < size and hasattr(os, "sendfile"):
+        try:
+            while copied < size:
+                n = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            pass
+    
+    if copied < size:
+        os.lseek(src_fd, copied, os.SEEK_SET)
+        view = _get_copy_buffer()
+        with io.FileIO(src_fd, "r", closefd=False) as src:
+            while copied < size:
+                n = src.readinto(view[:min(COPY_CHUNK_SIZE, size - copied)])
+                if not n:
+                    break
+                pending = view[:n]
+                while pending:
+                    written = os.write(dst_fd, pending)
+                    pending = pending[written:]
+                copied += n
+
+
+def _get_copy_buffer() -> memoryview:
+    """This thread's reusable chunk buffer for the read/write copy fallback."""
+    view = getattr(_copy_buffers, "view", None)
+    if view is None:
+        view = _copy_buffers.view = memoryview(bytearray(COPY_CHUNK_SIZE))
+    return view
+
+
+@lru_cache(maxsize=1)
+def _get_syncfs():
+    """libc syncfs(2) on Linux, None where it is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ctypes.CDLL(None, use_errno=True).syncfs
+    except (OSError, AttributeError):
+        return None
+
+
+def _copy_into(src_path: Path, dst_fd: int) -> None:
+    """Copy the contents of src_path into the open file dst_fd."""
+    src_fd = os.open(src_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        _copy_fd(src_fd, dst_fd, os.fstat(src_fd).st_size)
+    finally:
+        os.close(src_fd)
+    if hasattr(os, "posix_fadvise"):
+        # Output copies are never read back: start their writeback
+        # now and let the kernel drop the pages once clean, instead
+        # of crowding the page cache during long batches
+        os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _copy_file(src_path: Path, dst_path: str) -> None:
+    """
+    Copy file contents only (no metadata) to a new file at dst_path.
+    
+    The destination is created exclusively; a stale file left at dst_path
+    by an interrupted run is removed first.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    try:
+        dst_fd = os.open(dst_path, flags, 0o644)
+    except FileExistsError:
+        os.unlink(dst_path)
+        dst_fd = os.open(dst_path, flags, 0o644)
+    try:
+        _copy_into(src_path, dst_fd)
+    finally:
+        os.close(dst_fd)
+
+
 class RoutingEngine:
     """
     Handles fan-out routing of compressed images to person folders.
     
     Flow:
     1. Image is compressed ONCE to staging directory
-    2. For each matched person: if output exists, skip; else copy from staging
+    2. For each matched person: if output exists, skip; else hardlink or
+       copy from staging
     3. Clean up staging file
     
     Idempotency: deterministic filename (stem__hash.jpg) + skip when file exists.
@@ -36,10 +161,28 @@ class RoutingEngine:
     ):
         self.output_root = output_root
         self.staging_dir = staging_dir or settings.staging_dir
+        # Destination paths are joined as plain strings on the fan-out path
+        self._output_root_str = os.fspath(output_root)
+        
+        # Person rows looked up during the current batch (None = not found)
+        self._person_cache: dict[int, Optional[dict]] = {}
+        self._person_cache_batch: Optional[int] = None
         
         # Ensure directories exist
         self.staging_dir.mkdir(parents=True, exist_ok=True)
         self.output_root.mkdir(parents=True, exist_ok=True)
+        
+        # Hardlinks only work within one filesystem; cleared on the first
+        # failed link too (e.g. exFAT, which has none), so later
+        # destinations go straight to the copy
+        self._can_link = os.stat(self.staging_dir).st_dev == os.stat(self.output_root).st_dev
+        
+        # Unnamed temp files (Linux O_TMPFILE) for the copy path; cleared
+        # when the output filesystem doesn't support them
+        self._can_tmpfile = hasattr(os, "O_TMPFILE")
+        
+        # Set when a file was published since the last finalize_batch()
+        self._dirty = False
     
     async def route_image(
         self,
@@ -71,19 +214,18 @@ class RoutingEngine:
         # Generate deterministic output filename
         output_filename = generate_deterministic_filename(original_stem, file_hash)
         
-        results = []
-        
-        for person_id in matched_person_ids:
-            result = await self._route_to_person(
+        # Fan out to all persons at once; each destination's file work runs
+        # in a worker thread, so the copies overlap instead of queueing
+        return list(await asyncio.gather(*[
+            self._route_to_person(
                 batch_id=batch_id,
                 image_id=image_id,
                 person_id=person_id,
                 staged_path=staged_path,
                 output_filename=output_filename
             )
-            results.append(result)
-        
-        return results
+            for person_id in matched_person_ids
+        ]))
     
     async def _route_to_person(
         self,
@@ -97,28 +239,25 @@ class RoutingEngine:
         Route image to a single person's folder.
         Idempotent: skip if output exists (deterministic name).
         """
-        person = await get_person_by_id(person_id)
+        person = await self._get_person_cached(person_id, batch_id)
         if not person:
             return {"person_id": person_id, "status": "error", "error": "Person not found"}
 
-        person_folder = self.output_root / person["output_folder_rel"]
-        output_path = person_folder / output_filename
-        output_path_str = str(output_path)
-
-        if output_path.exists():
-            return {
-                "person_id": person_id,
-                "person_name": person["name"],
-                "output_path": output_path_str,
-                "status": "skipped",
-                "reason": "exists",
-            }
+        person_folder = os.path.join(self._output_root_str, person["output_folder_rel"])
+        output_path_str = os.path.join(person_folder, output_filename)
 
         try:
-            person_folder.mkdir(parents=True, exist_ok=True)
-            temp_output = output_path.with_suffix(".tmp")
-            shutil.copy2(staged_path, temp_output)
-            temp_output.rename(output_path)
+            status = await asyncio.to_thread(
+                self._place, staged_path, person_folder, output_path_str
+            )
+            if status == "skipped":
+                return {
+                    "person_id": person_id,
+                    "person_name": person["name"],
+                    "output_path": output_path_str,
+                    "status": "skipped",
+                    "reason": "exists",
+                }
             return {
                 "person_id": person_id,
                 "person_name": person["name"],
@@ -164,27 +303,22 @@ class RoutingEngine:
         output_filename = generate_deterministic_filename(original_stem, file_hash)
         
         # Create group folder path
-        group_folder = self.output_root / group_folder_name
-        output_path = group_folder / output_filename
-        output_path_str = str(output_path)
-        
-        # Idempotent: skip if output exists
-        if output_path.exists():
-            return [{
-                "group_folder": group_folder_name,
-                "output_path": output_path_str,
-                "status": "skipped",
-                "reason": "exists",
-            }]
+        group_folder = os.path.join(self._output_root_str, group_folder_name)
+        output_path_str = os.path.join(group_folder, output_filename)
         
         try:
-            # Create group folder if it doesn't exist
-            group_folder.mkdir(parents=True, exist_ok=True)
-            
-            # Atomic write: copy to temp, then rename
-            temp_output = output_path.with_suffix(".tmp")
-            shutil.copy2(staged_path, temp_output)
-            temp_output.rename(output_path)
+            # Idempotent: skip if output exists; otherwise create the group
+            # folder and publish (hardlink, or copy to temp then rename)
+            status = await asyncio.to_thread(
+                self._place, staged_path, group_folder, output_path_str
+            )
+            if status == "skipped":
+                return [{
+                    "group_folder": group_folder_name,
+                    "output_path": output_path_str,
+                    "status": "skipped",
+                    "reason": "exists",
+                }]
             
             return [{
                 "group_folder": group_folder_name,
@@ -200,6 +334,181 @@ class RoutingEngine:
                 "error": str(e),
             }]
     
+    async def plan_destinations(
+        self,
+        batch_id: int,
+        output_filename: str,
+        matched_person_ids: Optional[list[int]] = None,
+        group_folder_name: Optional[str] = None
+    ) -> list[str]:
+        """
+        Final output paths an image would be routed to, without writing.
+        
+        Uses the group folder when group_folder_name is given, otherwise one
+        path per matched person (unknown persons are left out). Paths are
+        joined lexically from the output root, same as _route_to_person, so
+        the caller can probe them with a single lstat each.
+        """
+        if group_folder_name:
+            return [os.path.join(self._output_root_str, group_folder_name, output_filename)]
+        
+        destinations = []
+        for person_id in matched_person_ids or []:
+            person = await self._get_person_cached(person_id, batch_id)
+            if person:
+                destinations.append(
+                    os.path.join(self._output_root_str, person["output_folder_rel"], output_filename)
+                )
+        return destinations
+    
+    async def _get_person_cached(self, person_id: int, batch_id: int) -> Optional[dict]:
+        """
+        get_person_by_id, memoized for the duration of one batch.
+        
+        Person rows don't change while a batch is routed, so each person is
+        read once per batch instead of once per image. The cache is dropped
+        whenever batch_id changes.
+        """
+        if batch_id != self._person_cache_batch:
+            self._person_cache.clear()
+            self._person_cache_batch = batch_id
+        if person_id not in self._person_cache:
+            self._person_cache[person_id] = await get_person_by_id(person_id)
+        return self._person_cache[person_id]
+    
+    def _place(self, staged_path: Path, folder: str, output_path: str) -> str:
+        """
+        Blocking file work for one destination (run in a worker thread).
+        
+        Returns "skipped" if output_path already exists (deterministic name),
+        otherwise publishes the staged file and returns "success". The
+        folder is only created when publishing finds it missing, so an
+        existing destination costs no extra mkdir or stat.
+        """
+        try:
+            return self._publish(staged_path, output_path)
+        except FileNotFoundError:
+            # First file for this folder
+            os.makedirs(folder, exist_ok=True)
+            return self._publish(staged_path, output_path)
+    
+    def _publish(self, staged_path: Path, output_path: str) -> str:
+        """
+        Atomically place a staged file at output_path.
+        
+        When staging and output share a filesystem the staged file is
+        hardlinked (no data copied, one directory entry per destination).
+        Otherwise (different device, or no hardlink support such as exFAT
+        drives) its bytes are copied in-kernel where possible to a temp file
+        and renamed into place. Metadata is not copied; the staged file is
+        freshly written and has none worth keeping.
+        
+        The link itself is the existence check: it fails with EEXIST when
+        the deterministic name is already published. Returns "skipped" in
+        that case, "success" otherwise.
+        """
+        if self._can_link:
+            try:
+                os.link(staged_path, output_path)
+                self._dirty = True
+                return "success"
+            except FileExistsError:
+                # Same deterministic name already published - identical content
+                return "skipped"
+            except OSError as e:
+                if e.errno not in _LINK_UNSUPPORTED:
+                    raise
+                self._can_link = False
+        
+        if os.path.lexists(output_path):
+            return "skipped"
+        
+        if self._can_tmpfile:
+            status = self._publish_tmpfile(staged_path, output_path)
+            if status is not None:
+                return status
+        
+        temp_output = output_path + ".tmp"
+        _copy_file(staged_path, temp_output)
+        os.rename(temp_output, output_path)
+        self._dirty = True
+        return "success"
+    
+    def _publish_tmpfile(self, staged_path: Path, output_path: str) -> Optional[str]:
+        """
+        Copy into an unnamed O_TMPFILE inode in the destination folder, then
+        link it in under its final name.
+        
+        No temp name ever appears in the folder, so concurrent copies of
+        the same output can't clobber each other's temp file, and a crash
+        leaves nothing behind. The link fails with EEXIST if the name was
+        published meanwhile ("skipped"). Returns None (and stops trying)
+        when the filesystem doesn't support O_TMPFILE; any other error
+        (EMFILE, ENOSPC, EACCES, ...) is raised like on the copy path.
+        """
+        folder, name = os.path.split(output_path)
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        try:
+            try:
+                tmp_fd = os.open(
+                    ".", os.O_TMPFILE | os.O_WRONLY | os.O_CLOEXEC, 0o644,
+                    dir_fd=dir_fd
+                )
+            except OSError as e:
+                if e.errno not in _TMPFILE_UNSUPPORTED:
+                    raise
+                self._can_tmpfile = False
+                return None
+            
+            try:
+                _copy_into(staged_path, tmp_fd)
+                # linkat(AT_SYMLINK_FOLLOW) through /proc names the inode;
+                # passing dst_dir_fd makes os.link use linkat, not link
+                try:
+                    os.link(
+                        f"/proc/self/fd/{tmp_fd}", name,
+                        dst_dir_fd=dir_fd, follow_symlinks=True
+                    )
+                except FileExistsError:
+                    return "skipped"
+                except OSError as e:
+                    if e.errno not in _PROC_LINK_UNAVAILABLE:
+                        raise
+                    # e.g. /proc not mounted; fall back to temp file + rename
+                    self._can_tmpfile = False
+                    return None
+            finally:
+                os.close(tmp_fd)
+        finally:
+            os.close(dir_fd)
+        
+        self._dirty = True
+        return "success"
+    
+    def finalize_batch(self) -> None:
+        """
+        Make everything published in this batch durable (blocking).
+        
+        One syncfs(2) on the output filesystem flushes all new files and
+        directory entries at once, instead of an fsync per file. Call before
+        the batch is marked COMMITTED. No-op if nothing was published, and
+        on platforms without syncfs (writeback is left to the OS there).
+        """
+        if not self._dirty:
+            return
+        self._dirty = False
+        
+        syncfs = _get_syncfs()
+        if syncfs is None:
+            return
+        fd = os.open(self._output_root_str, os.O_RDONLY)
+        try:
+            if syncfs(fd) != 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err), self._output_root_str)
+        finally:
+            os.close(fd)
+    
     def cleanup_staged_file(self, staged_path: Path) -> None:
         """
         Remove a file from staging after successful routing.
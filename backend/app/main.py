@@ -2,16 +2,18 @@
 FastAPI application entry point.
 Single-page application serving the Operator Panel.
 """
+import hashlib
 from pathlib import Path
+import jinja2
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 
 from .config import settings
 from .api import operator, tracker
 from .db.db import init_database
-from .middleware import setup_exception_handlers
+from .middleware import setup_exception_handlers, CachedStaticFiles
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -23,10 +25,12 @@ app = FastAPI(
 # Setup centralized error handling
 setup_exception_handlers(app)
 
-# Setup templates and static files
+# Setup static files (templates are built in the startup hook)
 BASE_DIR = Path(__file__).parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+# Static assets are served from memory (read once); debug mode reads from disk
+# so edits show up without a restart
+static_files_class = StaticFiles if settings.debug else CachedStaticFiles
+app.mount("/static", static_files_class(directory=str(BASE_DIR / "static")), name="static")
 
 # Include API routers
 app.include_router(operator.router, prefix="/api/operator", tags=["operator"])
@@ -40,6 +44,19 @@ async def startup_event():
     settings.ensure_directories()
     # Initialize database
     await init_database()
+    # Templates compile once; outside debug mode Jinja skips the per-render
+    # mtime check, and compiled bytecode (in cache_dir, created above)
+    # survives restarts
+    templates = Jinja2Templates(env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(BASE_DIR / "templates")),
+        autoescape=True,
+        auto_reload=settings.debug,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(str(settings.cache_dir)),
+    ))
+    app.state.templates = templates
+    # Pre-render the UI shell once; it uses no per-request context
+    app.state.home_html = templates.get_template("operator.html").render().encode("utf-8")
+    app.state.home_etag = f'"{hashlib.sha1(app.state.home_html).hexdigest()[:16]}"'
 
 
 # ============================================================================
@@ -98,7 +115,14 @@ async def system_info():
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Operator Panel - main and only UI page."""
-    return templates.TemplateResponse("operator.html", {"request": request})
+    if settings.debug:
+        # Render per request so template edits show up on reload
+        return app.state.templates.TemplateResponse("operator.html", {"request": request})
+    
+    etag = app.state.home_etag
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(app.state.home_html, headers={"ETag": etag})
 
 
 @app.get("/operator")
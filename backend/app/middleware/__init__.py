@@ -3,5 +3,6 @@ Middleware Package.
 Centralized middleware for error handling, logging, etc.
 """
 from .error_handler import setup_exception_handlers
+from .static_files import CachedStaticFiles
 
-__all__ = ["setup_exception_handlers"]
+__all__ = ["setup_exception_handlers", "CachedStaticFiles"]
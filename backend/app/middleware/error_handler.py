@@ -2,12 +2,19 @@
 Centralized Error Handling Middleware.
 Provides consistent error responses across all API endpoints.
 """
-import traceback
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 
+# Unexpected errors are logged through a queue: the request handler only
+# enqueues the record, a listener thread writes it to stderr
+logger = logging.getLogger("sortface.errors")
+
+
 class APIError(Exception):
     """Base class for API errors with consistent response format."""
     
@@ -77,6 +84,16 @@ def setup_exception_handlers(app: FastAPI) -> None:
     Register all exception handlers on the FastAPI app.
     Call this in main.py after creating the app.
     """
+    if not logger.handlers:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+        app.add_event_handler("shutdown", listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(logging.ERROR)
+        logger.propagate = False
     
     @app.exception_handler(APIError)
     async def api_error_handler(request: Request, exc: APIError):
@@ -120,7 +137,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
     async def general_exception_handler(request: Request, exc: Exception):
         """Handle unexpected errors with a generic response."""
         # Log the full traceback for debugging
-        traceback.print_exc()
+        logger.error("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
         
         return JSONResponse(
             status_code=500,
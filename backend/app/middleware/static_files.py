@@ -0,0 +1,49 @@
+"""
+In-memory static file serving.
+The UI assets are small and only change with a new release, so they are
+read once at startup and served from memory.
+"""
+import hashlib
+import mimetypes
+import os
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves from a manifest built once at startup.
+
+    Each file's bytes, ETag (content hash) and media type are kept in
+    memory, so a request costs no stat, open or read. Browsers revalidate
+    with If-None-Match and get a 304 while the content is unchanged.
+    Paths not in the manifest fall through to StaticFiles.
+    """
+
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self._manifest: dict[str, tuple[bytes, str, str]] = {}
+
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                etag = f'"{hashlib.md5(content).hexdigest()}"'
+                media_type = mimetypes.guess_type(filename)[0] or "text/plain"
+                rel_path = os.path.normpath(os.path.relpath(full_path, directory))
+                self._manifest[rel_path] = (content, etag, media_type)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        entry = self._manifest.get(path)
+        if entry is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        content, etag, media_type = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        for name, value in scope["headers"]:
+            if name == b"if-none-match" and value.decode("latin-1") == etag:
+                return Response(status_code=304, headers=headers)
+        return Response(content, media_type=media_type, headers=headers)
@@ -3,6 +3,8 @@ State writer for tracker UI.
 Writes state files atomically for read-only consumption.
 """
 import json
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,6 +12,24 @@ from typing import Optional
 from ..config import settings
 
 
+# Fields that change on every call; ignored when deciding whether a progress
+# update has anything new (elapsed_formatted still ticks once per second)
+_VOLATILE_PROGRESS_FIELDS = frozenset({
+    "updated_at",
+    "last_committed_time",
+    "elapsed_seconds",
+    "estimated_remaining_seconds",
+    "estimated_total_seconds",
+    "images_per_second",
+})
+
+# fdatasync skips the inode metadata flush; Windows only has fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
 class StateWriter:
     """
     Writes state files for the tracker UI.
@@ -21,12 +41,48 @@ class StateWriter:
     def __init__(self):
         self.state_dir = settings.state_dir
         self.state_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Written on every progress update; build the paths once
+        self._progress_path = self.state_dir / "progress.json"
+        self._progress_tmp = self.state_dir / "progress.tmp"
+        
+        self._last_progress_stable: Optional[dict] = None
+        
+        # Single-slot handoff to the writer thread (last write wins)
+        self._pending: Optional[tuple[dict, bool]] = None
+        self._writing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._writer_thread: Optional[threading.Thread] = None
     
-    def _atomic_write(self, file_path: Path, data: dict) -> None:
-        """Write data atomically using temp file + rename."""
-        temp_path = file_path.with_suffix(".tmp")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, default=str)
+    def _atomic_write(
+        self,
+        file_path: Path,
+        data: dict,
+        sync: bool = False,
+        temp_path: Optional[Path] = None
+    ) -> None:
+        """
+        Write data atomically using temp file + rename.
+        
+        The payload is encoded in one call (compact json.dumps runs on the C
+        encoder; indent or json.dump would use the pure-Python one) and
+        written with a single write. With sync, the data is flushed to disk
+        before the rename, so a crash can't leave a renamed but empty file.
+        """
+        payload = json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+        if temp_path is None:
+            temp_path = file_path.with_suffix(".tmp")
+        # Raw fd: no file object or userspace buffer to allocate per write
+        fd = os.open(temp_path, _TEMP_FLAGS, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            if sync:
+                _fdatasync(fd)
+        finally:
+            os.close(fd)
         temp_path.replace(file_path)
     
     def write_progress(
@@ -61,8 +117,12 @@ class StateWriter:
         remaining_formatted = None
         images_per_second = None
         
+        # One clock read for the elapsed time and both timestamps
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
         if start_time and processed_images > 0:
-            elapsed = datetime.now() - start_time
+            elapsed = now - start_time
             elapsed_seconds = elapsed.total_seconds()
             
             # Calculate rate and estimate remaining time
@@ -90,8 +150,8 @@ class StateWriter:
             "current_image": current_image,
             "last_committed_person": last_committed_person,
             "last_committed_image": last_committed_image,
-            "last_committed_time": datetime.now().isoformat() if last_committed_image else None,
-            "updated_at": datetime.now().isoformat(),
+            "last_committed_time": now_iso if last_committed_image else None,
+            "updated_at": now_iso,
             "source_root": source_root,
             "output_root": output_root,
             # Time tracking
@@ -104,8 +164,79 @@ class StateWriter:
             "images_per_second": images_per_second,
         }
         
-        progress_file = self.state_dir / "progress.json"
-        self._atomic_write(progress_file, data)
+        # Nothing visible changed since the last write - leave the file alone
+        stable = {k: v for k, v in data.items() if k not in _VOLATILE_PROGRESS_FIELDS}
+        if stable == self._last_progress_stable:
+            return
+        self._last_progress_stable = stable
+        
+        # Per-image updates are disposable; batch completion is worth a sync
+        self._submit(data, settings.atomic_fsync and current_batch_state == "COMMITTED")
+    
+    def _submit(self, data: dict, sync: bool) -> None:
+        """
+        Hand a progress snapshot to the writer thread without blocking.
+        
+        A snapshot still waiting when the next one arrives is replaced, so
+        bursts collapse into one write. A pending sync request is kept
+        when it is replaced.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                sync = sync or self._pending[1]
+            self._pending = (data, sync)
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop,
+                    name="progress-writer",
+                    daemon=True
+                )
+                self._writer_thread.start()
+            self._cond.notify_all()
+    
+    def _writer_loop(self) -> None:
+        """Writer thread: write the latest pending snapshot until closed."""
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                (data, sync), self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._atomic_write(
+                    self._progress_path,
+                    data,
+                    sync=sync,
+                    temp_path=self._progress_tmp
+                )
+            except Exception as e:
+                # Keep the thread alive; the next snapshot retries the write
+                print(f"Failed to write progress file: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted snapshot is on disk. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and not self._writing,
+                timeout
+            )
+    
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write any pending snapshot and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._writer_thread
+        if thread is not None:
+            thread.join(timeout)
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human-readable string."""
@@ -16,11 +16,18 @@ def compute_file_hash(file_path: Path, algorithm: str = "sha256") -> str:
     Returns:
         Hex digest of the file hash
     """
-    hasher = hashlib.new(algorithm)
     with open(file_path, "rb") as f:
-        # Read in 64KB chunks for memory efficiency
-        for chunk in iter(lambda: f.read(65536), b""):
-            hasher.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: reads into a reusable buffer and hashes in C
+            # without the GIL, bypassing per-chunk Python overhead
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        
+        hasher = hashlib.new(algorithm)
+        # Read in 1MB chunks into one reused buffer (fewer syscalls, no per-chunk allocation)
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
     return hasher.hexdigest()
 
 
@@ -3,18 +3,74 @@ Worker runner - batch processing loop.
 Runs as a separate process from the server.
 """
 import asyncio
+import ctypes
 import json
 import os
-from datetime import datetime
+import sys
+import time
 from pathlib import Path
 
 from ..config import settings
-from ..db.db import init_database
-from ..db.jobs import get_job_config, get_pending_batches, get_job_status, set_job_status
+from ..db.db import init_database, get_db
+from ..db.jobs import (
+    get_job_config,
+    get_pending_batches,
+    get_job_status,
+    set_job_status,
+    get_batches_by_states,
+    reset_processing_batches,
+    update_batch_state,
+    wake_dir,
+    wake_signal_stamp,
+    BatchState,
+)
 from ..engine.batch_engine import BatchEngine
 from ..state.state_writer import StateWriter
-from ..utils.logger import get_logger
+from ..utils.logger import get_logger, console
+from rich.console import Group
+from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+from rich.table import Table
+
+
+# While idle the worker sleeps until the wake file (see db.jobs.signal_worker)
+# is replaced: an inotify watch on Linux, otherwise a stat of the file this
+# often. The database is re-checked on a signal or after IDLE_RECHECK_S.
+WAKE_POLL_INTERVAL = 1.0
+IDLE_RECHECK_S = 30.0
+
+# inotify(7) event for a file renamed into the watched directory
+_IN_MOVED_TO = 0x00000080
+
+# Delay before retrying after an error in the main loop; doubles on each
+# consecutive error and resets after a batch completes
+ERROR_BACKOFF_MIN = 1.0
+ERROR_BACKOFF_MAX = 30.0
+
+# Maximum gap between heartbeat writes (tracker marks the worker offline after 10 s)
+HEARTBEAT_INTERVAL = 3.0
+
+
+def _open_dir_watch(directory: Path) -> int | None:
+    """
+    inotify fd that becomes readable when a file is renamed into directory.
+    
+    Returns None where inotify isn't available (non-Linux, no libc symbol,
+    watch limit reached); the caller then polls instead.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
 
 
 class WorkerRunner:
@@ -36,58 +92,80 @@ class WorkerRunner:
         self.running = True
         self._heartbeat_task: asyncio.Task | None = None
         self._current_status: str = "starting"
+        self._error_delay = ERROR_BACKOFF_MIN
+        self._pid = os.getpid()
+        # Heartbeat paths as plain strings, built once for os.open/os.replace
+        self._heartbeat_path = str(settings.state_dir / "worker_heartbeat.json")
+        self._heartbeat_tmp = self._heartbeat_path + ".tmp"
+        self._last_heartbeat = 0.0  # monotonic time of the last heartbeat write
         self._job_initialized: bool = False  # Track if current job was initialized
+        self._wake_stamp = None  # Wake signal seen when the DB was last read
+        self._wake_fd: int | None = None  # inotify watch on the wake directory
+        self._wake_event: asyncio.Event | None = None  # Set when _wake_fd is readable
+        # (wake stamp, monotonic time, value) of the last config/status read
+        self._config_cache: tuple | None = None
+        self._status_cache: tuple | None = None
     
     async def run(self):
         """Main worker loop."""
         # Initialize database
         await init_database()
         
+        self._start_wake_watch()
+        
         # Start background heartbeat task
         self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
         
         try:
             # Run resume logic first
-            self._current_status = "resuming"
+            self._set_status("resuming")
             await self._resume_interrupted()
             
             # Display CPU usage information
             self._display_cpu_usage_info()
             
-            self._current_status = "idle"
+            self._set_status("idle")
             
             # Main processing loop
             while self.running:
+                # Batch being processed in this iteration, for the error handler
+                current_batch: dict | None = None
                 try:
+                    # Taken before reading the DB, so a change made after the
+                    # read still wakes the idle wait below
+                    self._wake_stamp = wake_signal_stamp()
+                    
                     # Check if we have a job configured
-                    job_config = await get_job_config()
+                    job_config = await self._get_job_config_cached()
                     if not job_config.get("source_root") or not job_config.get("output_root"):
-                        self._current_status = "waiting_for_config"
+                        self._set_status("waiting_for_config")
                         self._job_initialized = False
+                        if self.batch_engine:
+                            self.batch_engine.close()
                         self.batch_engine = None
                         self.logger.info("No job configured. Waiting...")
-                        await asyncio.sleep(3)
+                        await self._wait_for_wake()
                         continue
                     
                     # Check job status - only process if "running"
-                    job_status = await get_job_status()
+                    job_status = await self._get_job_status_cached()
                     if job_status == "terminating":
                         await set_job_status("stopped")
                         job_status = "stopped"
                     if job_status != "running":
-                        self._current_status = "waiting_for_start"
+                        self._set_status("waiting_for_start")
                         self._job_initialized = False
                         if job_status == "stopped":
                             self.logger.info("Job stopped. Waiting for start command...")
                         else:
                             self.logger.info("Waiting for job to be started...")
-                        await asyncio.sleep(3)
+                        await self._wait_for_wake()
                         continue
                     
                     # Initialize/re-initialize when job not yet initialized
                     # This happens every time "Start Job" is clicked
                     if not self._job_initialized:
-                        self._current_status = "discovering_images"
+                        self._set_status("discovering_images")
                         
                         # Always clear old job data for fresh start
                         self.logger.info("Clearing old job data...")
@@ -112,6 +190,8 @@ class WorkerRunner:
                         if group_mode:
                             print(f"GROUP MODE: Only photos with ALL {len(selected_person_ids)} selected people → folder '{group_folder_name}'")
                         
+                        if self.batch_engine:
+                            self.batch_engine.close()
                         self.batch_engine = BatchEngine(
                             source_root=Path(job_config["source_root"]),
                             output_root=Path(job_config["output_root"]),
@@ -136,16 +216,15 @@ class WorkerRunner:
                     batches = await get_pending_batches(limit=1)
                     
                     if not batches:
-                        self._current_status = "completed"
+                        self._set_status("completed")
                         self.logger.info("[bold green]All batches completed![/bold green]")
                         await set_job_status("completed")
                         self._job_initialized = False  # Allow restart
-                        await asyncio.sleep(5)
                         continue
                     
                     # Process the batch with a progress bar
-                    batch = batches[0]
-                    self._current_status = f"processing_batch_{batch['batch_id']}"
+                    current_batch = batches[0]
+                    self._set_status(f"processing_batch_{current_batch['batch_id']}")
                     
                     with Progress(
                         SpinnerColumn(),
@@ -155,34 +234,33 @@ class WorkerRunner:
                         TimeRemainingColumn(),
                         expand=True
                     ) as progress:
-                        task_id = progress.add_task(f"Processing Batch {batch['batch_id']}", total=100)
+                        task_id = progress.add_task(f"Processing Batch {current_batch['batch_id']}", total=100)
                         
                         # Use a small background task to update progress (mocked since batch_engine is opaque)
                         # In a real scenario, batch_engine would take a callback
                         progress.update(task_id, advance=10)
-                        result = await self.batch_engine.process_batch(batch["batch_id"])
+                        result = await self.batch_engine.process_batch(current_batch["batch_id"])
                         progress.update(task_id, completed=100)
                     
-                    self.logger.info(f"Batch {batch['batch_id']} completed: {result}")
+                    self.logger.info(f"Batch {current_batch['batch_id']} completed: {result}")
+                    self._error_delay = ERROR_BACKOFF_MIN
                     
                 except Exception as e:
-                    self._current_status = f"error: {str(e)[:50]}"
-                    self.logger.error(f"Error in worker loop: {e}")
-                    import traceback
-                    self.logger.error(traceback.format_exc())
+                    self._set_status(f"error: {str(e)[:50]}")
+                    self.logger.exception(f"Error in worker loop: {e}")
                     
                     # CRITICAL FIX: Reset batch state if we were processing one
                     # Otherwise it stays stuck in PROCESSING and is never retried
-                    if 'batch' in locals() and isinstance(batch, dict) and batch.get("batch_id"):
+                    if current_batch is not None:
                         try:
-                            # Import here to avoid circular dependencies if any, though top-level is better
-                            from ..db.jobs import update_batch_state, BatchState
-                            self.logger.warning(f"  ⚠ Resetting batch {batch['batch_id']} to PENDING due to error")
-                            await update_batch_state(batch["batch_id"], BatchState.PENDING)
+                            self.logger.warning(f"  ⚠ Resetting batch {current_batch['batch_id']} to PENDING due to error")
+                            await update_batch_state(current_batch["batch_id"], BatchState.PENDING)
                         except Exception as reset_error:
                             self.logger.error(f"  Failed to reset batch state: {reset_error}")
-                            
-                    await asyncio.sleep(5)
+                    
+                    # Back off on repeated failures instead of retrying every 5 s
+                    await asyncio.sleep(self._error_delay)
+                    self._error_delay = min(self._error_delay * 2, ERROR_BACKOFF_MAX)
         finally:
             # Stop heartbeat task
             self.running = False
@@ -192,33 +270,151 @@ class WorkerRunner:
                     await self._heartbeat_task
                 except asyncio.CancelledError:
                     pass
+            if self.batch_engine:
+                self.batch_engine.close()
+            self.state_writer.close()
+            self._stop_wake_watch()
+    
+    def _cache_fresh(self, cached: tuple | None) -> bool:
+        """
+        True if a cached config/status read is still valid.
+        
+        Every config or status write replaces the wake file, so a read is
+        reused until the wake stamp moves (or IDLE_RECHECK_S passes, in case
+        a signal was lost). Without a wake file there is nothing to key on.
+        """
+        return (
+            cached is not None
+            and self._wake_stamp is not None
+            and cached[0] == self._wake_stamp
+            and time.monotonic() - cached[1] < IDLE_RECHECK_S
+        )
+    
+    async def _get_job_config_cached(self) -> dict:
+        """get_job_config, reused while no config/status change was signalled."""
+        if not self._cache_fresh(self._config_cache):
+            self._config_cache = (self._wake_stamp, time.monotonic(), await get_job_config())
+        return self._config_cache[2]
+    
+    async def _get_job_status_cached(self) -> str:
+        """get_job_status, reused while no config/status change was signalled."""
+        if not self._cache_fresh(self._status_cache):
+            self._status_cache = (self._wake_stamp, time.monotonic(), await get_job_status())
+        return self._status_cache[2]
+    
+    def _start_wake_watch(self) -> None:
+        """Watch the wake directory so idle waits need no polling (Linux)."""
+        directory = wake_dir()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        fd = _open_dir_watch(directory)
+        if fd is None:
+            self.logger.info(f"No inotify; polling for job changes every {WAKE_POLL_INTERVAL:g}s")
+            return
+        self._wake_event = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_reader(fd, self._on_wake_readable)
+        except NotImplementedError:
+            os.close(fd)
+            self._wake_event = None
+            return
+        self._wake_fd = fd
+    
+    def _stop_wake_watch(self) -> None:
+        """Unregister and close the inotify watch, if any."""
+        fd, self._wake_fd = self._wake_fd, None
+        if fd is not None:
+            asyncio.get_running_loop().remove_reader(fd)
+            os.close(fd)
+    
+    def _on_wake_readable(self) -> None:
+        """Drain pending inotify events and wake _wait_for_wake."""
+        try:
+            while os.read(self._wake_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._wake_event.set()
+    
+    async def _wait_for_wake(self, timeout: float = IDLE_RECHECK_S) -> None:
+        """
+        Sleep until the server signals a config/status change, or timeout.
+        
+        The server replaces the wake file on every change. With an inotify
+        watch the loop sleeps until that rename; without one it stats the
+        file every WAKE_POLL_INTERVAL (still no database queries).
+        """
+        deadline = time.monotonic() + timeout
+        while self.running:
+            # Clear before checking, so a signal between the check and the
+            # wait still sets the event
+            if self._wake_event is not None:
+                self._wake_event.clear()
+            if wake_signal_stamp() != self._wake_stamp:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wake_event is None:
+                await asyncio.sleep(min(WAKE_POLL_INTERVAL, remaining))
+                continue
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+    
+    def _set_status(self, status: str) -> None:
+        """Update the worker status, writing a heartbeat right away if it changed."""
+        if status == self._current_status:
+            return
+        self._current_status = status
+        try:
+            self._write_heartbeat()
+        except Exception as e:
+            self.logger.error(f"Heartbeat error: {e}")
     
     async def _heartbeat_loop(self):
         """
-        Background task that writes heartbeat every 3 seconds.
-        Runs independently of main processing loop.
+        Background task that writes a heartbeat at least every 3 seconds.
+        
+        Status changes write their own heartbeat (_set_status), so this
+        only fills the gaps. It has to stay a task: a batch keeps the main
+        loop busy for longer than the tracker's 10 s online window.
         """
         while self.running:
+            due = self._last_heartbeat + HEARTBEAT_INTERVAL - time.monotonic()
+            if due > 0:
+                await asyncio.sleep(due)
+                continue
             try:
                 self._write_heartbeat()
             except Exception as e:
                 self.logger.error(f"Heartbeat error: {e}")
-            await asyncio.sleep(3)
+                await asyncio.sleep(HEARTBEAT_INTERVAL)
     
     async def _clear_old_job_data(self):
         """Clear old job data when config changes."""
-        from ..db.db import get_db
-        
         db = await get_db()
         
         # Delete old batches, images, results, and commit log
-        # This allows starting fresh with new config
-        await db.execute("DELETE FROM commit_log")
-        await db.execute("DELETE FROM image_results")
-        await db.execute("DELETE FROM batches")
-        await db.execute("DELETE FROM images")
-        await db.execute("DELETE FROM jobs")
-        await db.commit()
+        # This allows starting fresh with new config. One script is one
+        # hop through aiosqlite's thread and one transaction.
+        try:
+            await db.executescript(
+                "BEGIN IMMEDIATE;"
+                "DELETE FROM commit_log;"
+                "DELETE FROM image_results;"
+                "DELETE FROM batches;"
+                "DELETE FROM images;"
+                "DELETE FROM jobs;"
+                "COMMIT;"
+            )
+        except Exception:
+            if db.in_transaction:
+                await db.rollback()
+            raise
         
         # Clear state files
         self.state_writer.clear_batch_states()
@@ -232,21 +428,18 @@ class WorkerRunner:
         - COMMITTING batches → re-run commit phase (_commit_batch), then COMMITTED
         - COMMITTED batches → skip forever
         """
-        from ..db.jobs import (
-            get_batches_by_state,
-            update_batch_state,
-            get_job_config,
-            BatchState,
-        )
-        
         self.logger.info("Running resume logic...")
         
-        processing = await get_batches_by_state(BatchState.PROCESSING)
-        for b in processing:
-            self.logger.info(f"  Resetting batch {b['batch_id']} from PROCESSING to PENDING")
-            await update_batch_state(b["batch_id"], BatchState.PENDING)
+        # One query for both interrupted states, split here
+        interrupted = await get_batches_by_states([BatchState.PROCESSING, BatchState.COMMITTING])
+        processing = [b for b in interrupted if b["state"] == BatchState.PROCESSING.value]
+        committing = [b for b in interrupted if b["state"] == BatchState.COMMITTING.value]
+        
+        if processing:
+            for b in processing:
+                self.logger.info(f"  Resetting batch {b['batch_id']} from PROCESSING to PENDING")
+            await reset_processing_batches()
         
-        committing = await get_batches_by_state(BatchState.COMMITTING)
         if committing:
             job_config = await get_job_config()
             src = job_config.get("source_root") or "."
@@ -257,20 +450,18 @@ class WorkerRunner:
                     Path(out),
                     state_writer=self.state_writer,
                 )
-                for b in committing:
-                    self.logger.info(f"  Finishing batch {b['batch_id']} (was COMMITTING)")
-                    await be._commit_batch(b["batch_id"])
+                try:
+                    for b in committing:
+                        self.logger.info(f"  Finishing batch {b['batch_id']} (was COMMITTING)")
+                        await be._commit_batch(b["batch_id"])
+                finally:
+                    be.close()
             else:
                 self.logger.warning("  No output_root in config; cannot finish COMMITTING batches")
         self.logger.info("Resume logic complete.")
     
     def _display_cpu_usage_info(self):
         """Display CPU usage configuration and warnings."""
-        from ..utils.logger import console
-        from rich.table import Table
-        from rich.panel import Panel
-        from rich.console import Group
-        
         cpu_count = os.cpu_count() or 4
         worker_count = settings.get_worker_count()
         usage_percent = (worker_count / cpu_count) * 100
@@ -298,16 +489,18 @@ class WorkerRunner:
     
     def _write_heartbeat(self):
         """Write heartbeat file for status monitoring."""
-        heartbeat_file = settings.state_dir / "worker_heartbeat.json"
-        heartbeat_data = {
-            "timestamp": datetime.now().isoformat(),
-            "pid": os.getpid(),
+        payload = json.dumps({
+            "ts_ns": time.time_ns(),  # epoch ns; the tracker formats it on read
+            "pid": self._pid,
             "status": self._current_status
-        }
+        }).encode("utf-8")
         
-        # Atomic write
-        temp_file = heartbeat_file.with_suffix(".tmp")
-        with open(temp_file, "w") as f:
-            json.dump(heartbeat_data, f)
-        temp_file.replace(heartbeat_file)
+        # Atomic write; one raw write, no file object or buffer per heartbeat
+        fd = os.open(self._heartbeat_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        os.replace(self._heartbeat_tmp, self._heartbeat_path)
+        self._last_heartbeat = time.monotonic()
 
@@ -16,6 +16,22 @@ from app.utils.logger import setup_logging, console
 from rich.panel import Panel
 from rich.table import Table
 
+try:
+    import uvloop  # installed with uvicorn[standard]; not available on Windows
+except ImportError:
+    uvloop = None
+
+
+def _run(coro):
+    """Run coro to completion, on uvloop when it is installed."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
 
 def main():
     """Start the batch processing worker."""
@@ -40,7 +56,7 @@ def main():
     # Run the worker
     runner = WorkerRunner()
     try:
-        asyncio.run(runner.run())
+        _run(runner.run())
     except KeyboardInterrupt:
         print("\nWorker stopped by user.")
 